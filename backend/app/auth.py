@@ -0,0 +1,140 @@
+# app/auth.py
+import hashlib
+import hmac
+import secrets
+import time
+from datetime import datetime, timedelta
+
+import jwt
+from flask import request, g
+
+from .cache import LRUCache
+from .config import settings
+from .models import Landlord, Tenant, RefreshToken
+from .responses import message, json_response
+from .utils import db_session
+
+# Endpoints that must keep working when a client still sends a stale token
+AUTH_EXEMPT_PATHS = {
+    '/signup/landlord',
+    '/login/landlord',
+    '/signup/tenant',
+    '/login/tenant',
+    '/token/refresh',
+}
+
+# Verified principals keyed by token digest. Entries never outlive the token's
+# own `exp`, and AUTH_CACHE_TTL bounds how long a deleted account stays valid.
+_principal_cache = LRUCache(settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_CACHE_TTL, name="auth.cache")
+
+_PRINCIPALS = (
+    ('landlord_id', Landlord),
+    ('tenant_id', Tenant),
+)
+
+def _token_digest(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def _load_principal(claims):
+    for claim, model in _PRINCIPALS:
+        if claim in claims:
+            found = db_session.query(model.id).filter(model.id == claims[claim]).first()
+            return (claim, found.id) if found else None
+    return None
+
+INVALID_TOKEN = message("Invalid or expired token")
+
+def _unauthorized():
+    return json_response(INVALID_TOKEN, 401)
+
+def authenticate_request():
+    """before_request hook: verify the bearer token and expose its principal on `g`.
+
+    Requests without a token stay anonymous (g.landlord_id and g.tenant_id are
+    None); requests with an invalid token are rejected with 401.
+    """
+    g.landlord_id = None
+    g.tenant_id = None
+    header = request.headers.get('Authorization', '')
+    if request.method == 'OPTIONS' or not header.startswith('Bearer '):
+        return None
+    if request.path in AUTH_EXEMPT_PATHS:
+        return None
+
+    token = header[len('Bearer '):].strip()
+    key = _token_digest(token)
+    principal = _principal_cache.get(key)
+    if principal is None:
+        try:
+            claims = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
+        except jwt.InvalidTokenError:
+            return _unauthorized()
+        principal = _load_principal(claims)
+        if principal is None:
+            return _unauthorized()
+        ttl = claims['exp'] - time.time() if 'exp' in claims else None
+        _principal_cache.set(key, principal, ttl)
+
+    claim, principal_id = principal
+    setattr(g, claim, principal_id)
+    return None
+
+# ---------------------------
+# Token issuing and refresh-token rotation
+# ---------------------------
+def issue_access_token(claim, principal_id):
+    """Return a short-lived HS256 access token for `claim` ('landlord_id' or 'tenant_id')."""
+    expiration = datetime.utcnow() + timedelta(seconds=settings.ACCESS_TOKEN_TTL)
+    return jwt.encode({claim: principal_id, 'exp': expiration}, settings.SECRET_KEY, algorithm='HS256')
+
+def _refresh_digest(secret):
+    return hmac.new(settings.SECRET_KEY.encode('utf-8'), secret.encode('utf-8'), hashlib.sha256).hexdigest()
+
+def issue_refresh_token(session, claim, principal_id):
+    """Add a refresh token for the principal to `session` and return its raw value.
+
+    Tokens look like `<row id>.<random secret>` so validation is a primary-key
+    lookup plus an HMAC comparison. The caller commits the session.
+    """
+    owner = getattr(RefreshToken, claim)
+    now = datetime.utcnow()
+    # Expired tokens are only ever pruned for the principal logging in, via its index
+    session.query(RefreshToken).filter(owner == principal_id, RefreshToken.expires_at < now).delete(
+        synchronize_session=False
+    )
+    secret = secrets.token_urlsafe(32)
+    refresh_token = RefreshToken(
+        token_hash=_refresh_digest(secret),
+        expires_at=now + timedelta(seconds=settings.REFRESH_TOKEN_TTL),
+        **{claim: principal_id}
+    )
+    session.add(refresh_token)
+    session.flush()
+    return f"{refresh_token.id}.{secret}"
+
+def rotate_refresh_token(session, raw_token):
+    """Consume a refresh token and issue its replacement.
+
+    Returns (claim, principal_id, new_refresh_token), or None when the token is
+    unknown, expired or was already used. The caller commits the session.
+    """
+    token_id, _, secret = raw_token.partition('.')
+    if not token_id.isdigit() or not secret:
+        return None
+    stored = session.query(RefreshToken).get(int(token_id))
+    if not stored or not hmac.compare_digest(stored.token_hash, _refresh_digest(secret)):
+        return None
+    if stored.expires_at <= datetime.utcnow():
+        session.delete(stored)
+        return None
+    # Delete-by-hash makes each refresh token single-use even under concurrent refreshes
+    consumed = session.query(RefreshToken).filter(
+        RefreshToken.id == stored.id,
+        RefreshToken.token_hash == stored.token_hash
+    ).delete(synchronize_session=False)
+    if not consumed:
+        return None
+    claim = 'landlord_id' if stored.landlord_id is not None else 'tenant_id'
+    principal_id = getattr(stored, claim)
+    session.expunge(stored)
+    return claim, principal_id, issue_refresh_token(session, claim, principal_id)
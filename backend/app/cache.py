@@ -0,0 +1,98 @@
+# app/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+from .metrics import metrics
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional per-entry TTL.
+
+    Hits and misses are counted in the metrics registry under `<name>.hits`
+    and `<name>.misses`, with the running `<name>.hit_ratio` as a gauge.
+    When `max_bytes` is set, `sizeof(value)` is charged per entry and the
+    least recently used entries are evicted to stay within it.
+    """
+
+    def __init__(self, maxsize, ttl=None, name="cache", max_bytes=None, sizeof=len):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def _record(self, hit):
+        # Called with the lock held
+        if hit:
+            self._hits += 1
+        else:
+            self._misses += 1
+        metrics.incr(f"{self.name}.hits" if hit else f"{self.name}.misses")
+        metrics.set(f"{self.name}.hit_ratio", round(self._hits / (self._hits + self._misses), 4))
+
+    def _remove(self, key):
+        # Called with the lock held
+        _, value = self._data.pop(key)
+        if self.max_bytes is not None:
+            self._bytes -= self.sizeof(value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self._record(True)
+                    return value
+                self._remove(key)
+            self._record(False)
+        return default
+
+    def set(self, key, value, ttl=None):
+        if ttl is None or (self.ttl is not None and self.ttl < ttl):
+            ttl = self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (expires_at, value)
+            if self.max_bytes is not None:
+                self._bytes += self.sizeof(value)
+            while len(self._data) > self.maxsize or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._data)))
+            if self.max_bytes is not None:
+                metrics.set(f"{self.name}.bytes", self._bytes)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            value = self._data[key][1]
+            self._remove(key)
+        return value
+
+    def discard(self, predicate):
+        """Remove every entry whose value satisfies `predicate` and return how many were removed."""
+        with self._lock:
+            keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+            for key in keys:
+                self._remove(key)
+            if self.max_bytes is not None:
+                metrics.set(f"{self.name}.bytes", self._bytes)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            if self.max_bytes is not None:
+                metrics.set(f"{self.name}.bytes", 0)
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,94 @@
+# app/compression.py
+"""Negotiated gzip/Brotli compression for JSON responses.
+
+compress_response() runs as an after_request hook. Buffered bodies of at
+least COMPRESS_MIN_SIZE bytes are compressed in one go; streamed bodies
+(/tenants, /complaints) have no known size and are always compressed
+chunk by chunk as they are sent. Handlers that cache their bodies can
+compress once with precompress() and send a stored variant with
+encoded_response(), which the hook then leaves alone.
+
+Brotli is used when the brotli package is installed and the client
+accepts it; gzip otherwise.
+"""
+import zlib
+
+from flask import Response, request
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+def _gzip(data):
+    compressor = zlib.compressobj(settings.GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+def _gzip_stream():
+    compressor = zlib.compressobj(settings.GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+def _brotli(data):
+    return brotli.compress(data, quality=settings.BROTLI_QUALITY)
+
+def _brotli_stream():
+    compressor = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+    return compressor.process, compressor.finish
+
+# In order of preference: (encoding, one-shot compress, streaming compressor factory)
+ENCODINGS = [('gzip', _gzip, _gzip_stream)]
+if brotli is not None:
+    ENCODINGS.insert(0, ('br', _brotli, _brotli_stream))
+
+def _negotiate():
+    accepted = request.accept_encodings
+    for encoding, compress, stream in ENCODINGS:
+        if accepted[encoding] > 0:
+            return encoding, compress, stream
+    return None
+
+def precompress(body):
+    """Return {encoding: compressed body} for every supported encoding, or {} below the size threshold."""
+    if len(body) < settings.COMPRESS_MIN_SIZE:
+        return {}
+    return {encoding: compress(body) for encoding, compress, _ in ENCODINGS}
+
+def encoded_response(body, variants, headers=None):
+    """JSON response sending the variant from precompress() that the client accepts, else `body`."""
+    negotiated = _negotiate() if variants else None
+    encoding = negotiated[0] if negotiated else None
+    response = Response(variants.get(encoding, body), status=200, mimetype='application/json', headers=headers)
+    if encoding in variants:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+def _compressed_chunks(chunks, stream):
+    process, finish = stream()
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+def compress_response(response):
+    """after_request hook: compress JSON bodies the client accepts an encoding for."""
+    if (response.status_code != 200 or response.mimetype != 'application/json'
+            or request.method == 'HEAD' or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    if not response.is_streamed and len(response.get_data()) < settings.COMPRESS_MIN_SIZE:
+        return response
+    negotiated = _negotiate()
+    if negotiated is None:
+        return response
+    encoding, compress, stream = negotiated
+    if response.is_streamed:
+        response.response = _compressed_chunks(response.iter_encoded(), stream)
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(compress(response.get_data()))
+    response.headers['Content-Encoding'] = encoding
+    return response
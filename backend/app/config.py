@@ -3,5 +3,70 @@ import os
 
 class Settings:
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./house_management.db")
+    SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 
-settings = Settings()
\ No newline at end of file
+    # Optional read replica for GET requests, e.g. a copy of the SQLite file or
+    # "sqlite:///file:house_management.db?mode=ro&uri=true". Clients that just
+    # wrote keep reading from the primary for READ_STICKY_SECONDS.
+    READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", "")
+    READ_STICKY_SECONDS = float(os.getenv("READ_STICKY_SECONDS", "5"))
+
+    # Connection pool (pool size/overflow/timeout apply to server databases such as PostgreSQL)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+    # Opt-in SQLite production profile (WAL, mmap, larger page cache, busy timeout)
+    SQLITE_PERFORMANCE = os.getenv("SQLITE_PERFORMANCE", "false").lower() in ("1", "true", "yes")
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+    # In-memory address autocomplete index behind /houses/suggest
+    SUGGEST_REFRESH_SECONDS = int(os.getenv("SUGGEST_REFRESH_SECONDS", "300"))
+    SUGGEST_DEFAULT_LIMIT = int(os.getenv("SUGGEST_DEFAULT_LIMIT", "10"))
+
+    # Encoded /houses pages kept in memory per process, bounded by count and total size
+    HOUSES_CACHE_SIZE = int(os.getenv("HOUSES_CACHE_SIZE", "1024"))
+    HOUSES_CACHE_MAX_BYTES = int(os.getenv("HOUSES_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    HOUSES_CACHE_TTL = int(os.getenv("HOUSES_CACHE_TTL", "300"))
+
+    # Response compression: bodies below COMPRESS_MIN_SIZE bytes are sent as they are
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+    # Rows fetched per batch when streaming /tenants and /complaints (server-side cursor on PostgreSQL)
+    STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "1000"))
+
+    # Password hashing worker pool (bcrypt runs off the request thread).
+    # A request waiting on a hash still holds its server thread, so at most
+    # POOL_SIZE + QUEUE_DEPTH hashes, and never more than half of
+    # SERVER_THREADS, are admitted; the rest get a 503 right away. Set
+    # SERVER_THREADS to the request threads of one process (e.g. gunicorn's
+    # --threads) and keep POOL_SIZE + QUEUE_DEPTH below it.
+    SERVER_THREADS = int(os.getenv("SERVER_THREADS", "16"))
+    PASSWORD_POOL_SIZE = int(os.getenv("PASSWORD_POOL_SIZE", "4"))
+    PASSWORD_QUEUE_DEPTH = int(os.getenv("PASSWORD_QUEUE_DEPTH", "4"))
+    PASSWORD_RETRY_AFTER = int(os.getenv("PASSWORD_RETRY_AFTER", "1"))
+
+    # bcrypt work factor: fixed when BCRYPT_ROUNDS is set, otherwise calibrated
+    # at startup to the highest cost that hashes within BCRYPT_TARGET_MS. Set it
+    # when running several workers so they all hash at the same cost.
+    BCRYPT_ROUNDS = os.getenv("BCRYPT_ROUNDS")
+    BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", "50"))
+    BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", "10"))
+    BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", "16"))
+
+    # Verified-token cache used by the authentication middleware
+    AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+    AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "300"))
+
+    # Token lifetimes in seconds: short-lived access JWTs, long-lived rotating refresh tokens
+    ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL", "900"))
+    REFRESH_TOKEN_TTL = int(os.getenv("REFRESH_TOKEN_TTL", str(30 * 24 * 3600)))
+
+settings = Settings()
@@ -1,527 +1,759 @@
-from flask import request, Response, make_response
+from flask import request, make_response
 from flask_restful import Resource
+from sqlalchemy import func
 from app.models import Landlord, Tenant, House, Payment, Complaint
-from app.utils import SessionLocal
-from datetime import datetime, timedelta
-import bcrypt
-import jwt
+from app.utils import db_session, engine, cursor_blocks_writers
+from app.config import settings
+from app.auth import issue_access_token, issue_refresh_token, rotate_refresh_token
+from app.queries import (
+    HOUSE_FIELDS, TENANT_FIELDS, COMPLAINT_FIELDS, HOUSE_SORT_KEYS,
+    houses_select, tenants_select, complaints_select
+)
+from app.search import address_match_param, address_index
+from app.compression import precompress, encoded_response
+from app.house_cache import CachedPage, house_list_cache, house_page_flights
+from app.versions import table_etag
+from app.hashing import hash_password, check_password, needs_rehash, schedule_rehash, PasswordPoolBusy
+from app.responses import dumps, message, json_response, error_response, not_modified, stream_array
+from app.schemas import (
+    validated, SignUp, Login, TokenRefresh, NewHouse, MoveIn, MoveOut, RentPayment, NewComplaint, ComplaintStatus
+)
+from datetime import datetime
+import base64
+import binascii
 import json
 import traceback
 
+# ---------------------------
+# Static response bodies, encoded once at import
+# ---------------------------
+INVALID_CREDENTIALS = message("Invalid credentials")
+EMAIL_EXISTS = message("Email already exists")
+SERVER_BUSY = message("Server busy, please retry shortly")
+LANDLORD_CREATED = message("Landlord created successfully")
+TENANT_CREATED = message("Tenant created successfully")
+INVALID_REFRESH_TOKEN = message("Invalid or expired refresh token")
+HOUSE_ADDED = message("House added successfully")
+INVALID_LIMIT = message("limit must be an integer")
+TENANT_NOT_FOUND = message("Tenant not found")
+TENANT_ALREADY_HOUSED = message("Tenant already rented an apartment")
+TENANT_NOT_HOUSED = message("Tenant not assigned to a house")
+NO_VACANCIES = message("No vacant apartments available")
+TENANT_MOVED_IN = message("Tenant moved in successfully")
+TENANT_MOVED_OUT = message("Tenant moved out successfully")
+RENT_NOT_PAID = message("Tenant has not paid rent")
+RENT_ALREADY_PAID = message("Rent already paid for this month")
+RENT_PAYMENT_RECORDED = message("Rent payment recorded successfully")
+COMPLAINT_NOT_FOUND = message("Complaint not found")
+COMPLAINT_SUBMITTED = message("Complaint submitted successfully")
+COMPLAINT_STATUS_UPDATED = message("Complaint status updated successfully")
+INVALID_PERIOD = message("Periods must be formatted as YYYY-MM")
+
+# ---------------------------
+# Column projection for list endpoints
+# ---------------------------
+# List endpoints select only the columns they serialize (never password hashes)
+# and accept ?fields=a,b to trim the payload further. Column maps live in app.queries.
+RENT_STATUS_FIELDS = (
+    "id", "name", "email", "house_id", "rent_price", "payment_status", "amount_paid", "arrears", "months"
+)
+
+def _requested_fields(allowed):
+    """Return the field names selected by ?fields=, defaulting to all of `allowed`."""
+    raw = request.args.get('fields')
+    if not raw:
+        return tuple(allowed)
+    fields = tuple(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in allowed]
+    if unknown or not fields:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}" if unknown else "no fields requested")
+    return fields
+
+def _invalid_fields(error):
+    return error_response("Invalid fields parameter", error, 400)
+
+def _stream_rows(key, fields, stmt, params):
+    """Stream {"<key>": [...]} for a Core select as chunked JSON, one batch of rows per chunk.
+
+    Rows are fetched with yield_per (a server-side cursor on PostgreSQL), so
+    only one batch is in memory however many rows match. The stream holds its
+    own connection rather than the request session's, because the session is
+    removed at teardown before the body is sent; the connection is returned
+    to the pool when the response closes. The statement runs before this
+    returns, so query errors still surface as a normal error response.
+
+    On SQLite without WAL an open cursor would block every writer for as long
+    as the client takes to download, so there the rows are read in full and
+    the connection released before the body is sent.
+    """
+    bind = db_session.get_bind()
+    buffered = cursor_blocks_writers(bind)
+    connection = bind.connect()
+    try:
+        if buffered:
+            rows = connection.execute(stmt, params).all()
+        else:
+            result = connection.execute(stmt, params, execution_options={"yield_per": settings.STREAM_BATCH_SIZE})
+    except Exception:
+        connection.close()
+        raise
+
+    if buffered:
+        connection.close()
+        size = settings.STREAM_BATCH_SIZE
+        batches = ([dict(zip(fields, row)) for row in rows[i:i + size]] for i in range(0, len(rows), size))
+        return stream_array(key, batches)
+
+    batches = ([dict(zip(fields, row)) for row in batch] for batch in result.partitions())
+    response = stream_array(key, batches)
+    response.call_on_close(result.close)
+    response.call_on_close(connection.close)
+    return response
+
 # ---------------------------
 # Landlord Authentication and House Management
 # ---------------------------
 class LandlordSignUpResource(Resource):
-    def post(self):
-        data = request.get_json()
-        # Validate required fields
-        if not data.get('name') or not data.get('email') or not data.get('password'):
-            return Response(
-                '{"message": "Missing required fields"}',
-                status=400,
-                mimetype='application/json'
-            )
+    @validated(SignUp)
+    def post(self, data):
 
-        session = SessionLocal()
-        existing_landlord = session.query(Landlord).filter_by(email=data['email']).first()
+        session = db_session
+        existing_landlord = session.query(Landlord).filter_by(email=data.email).first()
         if existing_landlord:
-            session.close()
-            return Response(
-                '{"message": "Email already exists"}',
-                status=400,
-                mimetype='application/json'
-            )
+            return json_response(EMAIL_EXISTS, 400)
 
         # Hash the password
-        hashed_password = bcrypt.hashpw(data['password'].encode('utf-8'), bcrypt.gensalt())
+        try:
+            hashed_password = hash_password(data.password)
+        except PasswordPoolBusy:
+            return json_response(SERVER_BUSY, 503, headers={'Retry-After': str(settings.PASSWORD_RETRY_AFTER)})
         new_landlord = Landlord(
-            name=data['name'],
-            email=data['email'],
-            password=hashed_password.decode('utf-8')
+            name=data.name,
+            email=data.email,
+            password=hashed_password
         )
         try:
-            with SessionLocal() as session:
-                session.add(new_landlord)
-                session.commit()
-                return Response(
-                    '{"message": "Landlord created successfully"}',
-                    status=201,
-                    mimetype='application/json'
-                )
+            session.add(new_landlord)
+            session.commit()
+            return json_response(LANDLORD_CREATED, 201)
         except Exception as e:
             session.rollback()
-            return Response(
-                '{"message": "Error creating landlord", "error": "' + str(e) + '"}',
-                status=500,
-                mimetype='application/json'
-            )
-        finally:
-            session.close()
+            return error_response("Error creating landlord", e)
 
 class LandlordLoginResource(Resource):
-    def post(self):
-        data = request.get_json()
-        if not data.get('email') or not data.get('password'):
-            return Response(
-                '{"message": "Email and password are required"}',
-                status=400,
-                mimetype='application/json'
-            )
-        session = SessionLocal()
+    @validated(Login)
+    def post(self, data):
+        session = db_session
         try:
-            landlord = session.query(Landlord).filter_by(email=data['email']).first()
-            if not landlord or not bcrypt.checkpw(data['password'].encode('utf-8'), landlord.password.encode('utf-8')):
-                return Response(
-                    '{"message": "Invalid credentials"}',
-                    status=401,
-                    mimetype='application/json'
-                )
+            landlord = session.query(Landlord).filter_by(email=data.email).first()
+            if not landlord or not check_password(data.password, landlord.password):
+                return json_response(INVALID_CREDENTIALS, 401)
+            if needs_rehash(landlord.password):
+                schedule_rehash(Landlord, landlord.id, data.password, landlord.password)
             token = self.generate_token(landlord.id)
-            response_data = json.dumps({
+            refresh_token = issue_refresh_token(session, 'landlord_id', landlord.id)
+            session.commit()
+            return json_response({
                 "message": "Login successful",
                 "token": token,
+                "refresh_token": refresh_token,
                 "landlord_id": landlord.id
             })
-            return Response(response_data, status=200, mimetype='application/json')
-        finally:
-            session.close()
+        except PasswordPoolBusy:
+            return json_response(SERVER_BUSY, 503, headers={'Retry-After': str(settings.PASSWORD_RETRY_AFTER)})
 
     def generate_token(self, landlord_id):
-        expiration = datetime.utcnow() + timedelta(days=7)
-        token = jwt.encode({'landlord_id': landlord_id, 'exp': expiration},
-                           'your-secret-key-here',
-                           algorithm='HS256')
-        return token
+        return issue_access_token('landlord_id', landlord_id)
 
 # ---------------------------
 # House Management Resource
 # ---------------------------
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def _page_limit():
+    limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, MAX_PAGE_SIZE)
+
+def _encode_cursor(*values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii').rstrip('=')
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _decode_cursor(token):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        values = None
+    if not isinstance(values, list) or not values:
+        raise ValueError("malformed cursor")
+    return values
+
 class HouseResource(Resource):
     def get(self):
-        session = SessionLocal()
+        session = db_session
         landlord_id = request.args.get('landlord_id')
         address = request.args.get('address')
-        rent_price = request.args.get('rent_price')
+        # Vacancy search: ?min_price=&max_price=&vacant_only=true&sort=rent_price (rent_price is an alias of max_price)
+        min_price = request.args.get('min_price')
+        max_price = request.args.get('max_price') or request.args.get('rent_price')
+        vacant_only = request.args.get('vacant_only', '').lower() in ('1', 'true', 'yes')
+        # Keyset pagination: ?limit=N&sort=id|rent_price|relevance&cursor=<next_cursor from the previous page>
+        sort = request.args.get('sort', 'relevance' if address else 'id')
+        cursor = request.args.get('cursor')
         try:
-            query = session.query(House)
-            # Filter by landlord_id if provided
-            if landlord_id:
-                query = query.filter(House.landlord_id == landlord_id)
-            # Additional tenant filters: address and rent price
+            fields = _requested_fields(HOUSE_FIELDS)
+            landlord_id = int(landlord_id) if landlord_id else None
+            min_price = float(min_price) if min_price else None
+            max_price = float(max_price) if max_price else None
+            limit = _page_limit()
+            if sort not in HOUSE_SORT_KEYS and not (sort == 'relevance' and address):
+                raise ValueError("unknown sort")
+            if cursor:
+                cursor_sort, *cursor = _decode_cursor(cursor)
+                if cursor_sort != sort or len(cursor) != 2:
+                    raise ValueError("cursor does not match sort")
+                # Both positions are bound straight into the keyset predicate
+                last_key, last_id = cursor
+                if not _is_number(last_key) or not isinstance(last_id, int) or isinstance(last_id, bool):
+                    raise ValueError("malformed cursor")
+            # Every part of the cache key is validated above, so it is always hashable
+            after = tuple(cursor) if cursor else None
+            key = (fields, sort, address, landlord_id, min_price, max_price, vacant_only, limit, after)
+        except ValueError as e:
+            return error_response("Invalid search parameters", e, 400)
+
+        page = house_list_cache.get(key)
+        if page is not None:
+            return encoded_response(page.body, page.variants, headers={'X-Cache': 'HIT'})
+        generation = house_list_cache.generation()
+
+        def load_page():
+            params = {
+                "landlord_id": landlord_id,
+                "min_price": min_price,
+                "max_price": max_price,
+                "limit": limit + 1  # one extra row tells us whether another page exists
+            }
+            # Address filter: the search index when the database has one, ILIKE otherwise
+            search = None
             if address:
-                query = query.filter(House.address.ilike(f"%{address}%"))
-            if rent_price:
-                query = query.filter(House.rent_price <= float(rent_price))
-            houses = query.all()
-            house_list = [
-                {
-                    "id": house.id,
-                    "address": house.address,
-                    "num_apartments": house.num_apartments,
-                    "rent_price": house.rent_price,
-                    "landlord_id": house.landlord_id,
-                    "vacant_apartments": house.vacant_apartments
-                }
-                for house in houses
-            ]
-            response_data = json.dumps({"houses": house_list})
-            return Response(response_data, status=200, mimetype="application/json")
-        except Exception as e:
-            return Response(
-                json.dumps({"message": "Error fetching houses", "error": str(e)}),
-                status=500,
-                mimetype="application/json"
+                search = session.get_bind().dialect.name
+                params["match"] = address_match_param(search, address)
+                if params["match"] is None:
+                    search = 'ilike'
+                    params["address_pattern"] = f"%{address}%"
+            if cursor:
+                params["last_key"], params["last_id"] = cursor
+            stmt = houses_select(
+                fields, sort, search, landlord_id is not None,
+                min_price is not None, max_price is not None, vacant_only, bool(cursor)
             )
-        finally:
-            session.close()
-
-    def post(self):
-        data = request.get_json()
-        # Validate required fields (include landlord_id!)
-        if not data.get('address') or not data.get('num_apartments') or not data.get('rent_price') or not data.get('landlord_id'):
-            return Response(
-                '{"message": "Missing required house data"}',
-                status=400,
-                mimetype='application/json'
+            # Pages are cached until a write invalidates them, so fill from the primary:
+            # a lagging replica could return rows from before that write
+            rows = session.connection(bind_arguments={"bind": engine}).execute(stmt, params).all()
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = _encode_cursor(sort, rows[-1].sort_key, rows[-1].cursor_id)
+            house_list = [dict(zip(fields, row)) for row in rows]
+            body = dumps({"houses": house_list, "next_cursor": next_cursor})
+            # Compressed once here, so cache hits never pay for compression
+            page = CachedPage(
+                body=body,
+                variants=precompress(body),
+                ids=frozenset(row.cursor_id for row in rows),
+                sort=sort,
+                landlord_id=landlord_id,
+                min_price=min_price,
+                max_price=max_price,
+                vacant_only=vacant_only,
+                searched=bool(address),
+                after=after,
+                last=(rows[-1].sort_key, rows[-1].cursor_id) if next_cursor else None
             )
+            house_list_cache.set(key, page, generation)
+            return page
+
+        try:
+            # The generation is part of the key, so a request that starts after a write
+            # never joins a query that began before it
+            page, shared = house_page_flights.do((generation, key), load_page)
+            return encoded_response(page.body, page.variants, headers={'X-Cache': 'SHARED' if shared else 'MISS'})
+        except Exception as e:
+            return error_response("Error fetching houses", e)
+
+    @validated(NewHouse)
+    def post(self, data):
         new_house = House(
-            address=data['address'],
-            num_apartments=data['num_apartments'],
-            rent_price=data['rent_price'],
-            vacant_apartments=data['num_apartments'],
-            landlord_id=data['landlord_id']
+            address=data.address,
+            num_apartments=data.num_apartments,
+            rent_price=data.rent_price,
+            vacant_apartments=data.num_apartments,
+            landlord_id=data.landlord_id
         )
-        session = SessionLocal()
+        session = db_session
         try:
             session.add(new_house)
             session.commit()
-            return Response(
-                '{"message": "House added successfully"}',
-                status=201,
-                mimetype='application/json'
-            )
+            address_index.add(new_house.id, new_house.address)
+            house_list_cache.house_added(new_house)
+            return json_response(HOUSE_ADDED, 201)
         except Exception as e:
             session.rollback()
             print(f"Error adding house: {e}")
             print("Traceback:", traceback.format_exc())
-            return Response(
-                json.dumps({"message": "Error adding house", "error": str(e)}),
-                status=500,
-                mimetype="application/json"
-            )
-        finally:
-            session.close()
+            return error_response("Error adding house", e)
+
+class HouseSuggestResource(Resource):
+    def get(self):
+        prefix = request.args.get('q', '')
+        try:
+            limit = min(int(request.args.get('limit', settings.SUGGEST_DEFAULT_LIMIT)), MAX_PAGE_SIZE)
+        except ValueError:
+            return json_response(INVALID_LIMIT, 400)
+        try:
+            # Only touches the database when the in-memory index needs (re)building
+            address_index.ensure_loaded(db_session)
+            return json_response({"suggestions": address_index.suggest(prefix, limit)})
+        except Exception as e:
+            return error_response("Error fetching suggestions", e)
 
 # ---------------------------
 # Tenant Authentication and Actions
 # ---------------------------
 class TenantSignUpResource(Resource):
-    def post(self):
-        data = request.get_json()
-        if not data.get('name') or not data.get('email') or not data.get('password'):
-            return Response(
-                '{"message": "Missing required fields"}',
-                status=400,
-                mimetype='application/json'
-            )
-        hashed_password = bcrypt.hashpw(data['password'].encode('utf-8'), bcrypt.gensalt())
+    @validated(SignUp)
+    def post(self, data):
+        try:
+            hashed_password = hash_password(data.password)
+        except PasswordPoolBusy:
+            return json_response(SERVER_BUSY, 503, headers={'Retry-After': str(settings.PASSWORD_RETRY_AFTER)})
         new_tenant = Tenant(
-            name=data['name'],
-            email=data['email'],
-            password=hashed_password.decode('utf-8')
+            name=data.name,
+            email=data.email,
+            password=hashed_password
         )
-        session = SessionLocal()
+        session = db_session
         try:
             session.add(new_tenant)
             session.commit()
-            return Response(
-                '{"message": "Tenant created successfully"}',
-                status=201,
-                mimetype='application/json'
-            )
+            return json_response(TENANT_CREATED, 201)
         except Exception as e:
             session.rollback()
-            return Response(
-                json.dumps({"message": "Error creating tenant", "error": str(e)}),
-                status=500,
-                mimetype="application/json"
-            )
-        finally:
-            session.close()
+            return error_response("Error creating tenant", e)
 
 class TenantLoginResource(Resource):
-    def post(self):
-        data = request.get_json()
-        if not data.get('email') or not data.get('password'):
-            return Response(
-                '{"message": "Email and password are required"}',
-                status=400,
-                mimetype='application/json'
-            )
-        session = SessionLocal()
+    @validated(Login)
+    def post(self, data):
+        session = db_session
         try:
-            tenant = session.query(Tenant).filter_by(email=data['email']).first()
-            if not tenant or not bcrypt.checkpw(data['password'].encode('utf-8'), tenant.password.encode('utf-8')):
-                return Response(
-                    '{"message": "Invalid credentials"}',
-                    status=401,
-                    mimetype='application/json'
-                )
+            tenant = session.query(Tenant).filter_by(email=data.email).first()
+            if not tenant or not check_password(data.password, tenant.password):
+                return json_response(INVALID_CREDENTIALS, 401)
+            if needs_rehash(tenant.password):
+                schedule_rehash(Tenant, tenant.id, data.password, tenant.password)
             token = self.generate_token(tenant.id)
-            return Response(
-                json.dumps({"message": "Login successful", "token": token}),
-                status=200,
-                mimetype='application/json'
-            )
-        finally:
-            session.close()
+            refresh_token = issue_refresh_token(session, 'tenant_id', tenant.id)
+            session.commit()
+            return json_response({"message": "Login successful", "token": token, "refresh_token": refresh_token})
+        except PasswordPoolBusy:
+            return json_response(SERVER_BUSY, 503, headers={'Retry-After': str(settings.PASSWORD_RETRY_AFTER)})
 
     def generate_token(self, tenant_id):
-        expiration = datetime.utcnow() + timedelta(days=7)
-        token = jwt.encode({'tenant_id': tenant_id, 'exp': expiration}, 'your-secret-key-here', algorithm='HS256')
-        return token
+        return issue_access_token('tenant_id', tenant_id)
+
+class TokenRefreshResource(Resource):
+    @validated(TokenRefresh)
+    def post(self, data):
+        session = db_session
+        try:
+            rotated = rotate_refresh_token(session, data.refresh_token)
+            if not rotated:
+                session.commit()
+                return json_response(INVALID_REFRESH_TOKEN, 401)
+            claim, principal_id, refresh_token = rotated
+            session.commit()
+            return json_response({
+                "message": "Token refreshed",
+                "token": issue_access_token(claim, principal_id),
+                "refresh_token": refresh_token,
+                claim: principal_id
+            })
+        except Exception as e:
+            session.rollback()
+            return error_response("Error refreshing token", e)
 
 class TenantMoveInResource(Resource):
-    def post(self):
-        data = request.get_json()
-        if not data.get('tenant_id') or not data.get('house_id'):
-            return Response(
-                '{"message": "tenant_id and house_id are required"}',
-                status=400,
-                mimetype='application/json'
-            )
-        session = SessionLocal()
+    @validated(MoveIn)
+    def post(self, data):
+        session = db_session
         try:
-            tenant = session.query(Tenant).get(data['tenant_id'])
+            tenant = session.query(Tenant).get(data.tenant_id)
             if not tenant:
-                return Response(
-                    '{"message": "Tenant not found"}',
-                    status=404,
-                    mimetype='application/json'
-                )
+                return json_response(TENANT_NOT_FOUND, 404)
             if tenant.house_id:
-                return Response(
-                    '{"message": "Tenant already rented an apartment"}',
-                    status=400,
-                    mimetype='application/json'
-                )
-            house = session.query(House).get(data['house_id'])
+                return json_response(TENANT_ALREADY_HOUSED, 400)
+            house = session.query(House).get(data.house_id)
             if not house or house.vacant_apartments <= 0:
-                return Response(
-                    '{"message": "No vacant apartments available"}',
-                    status=400,
-                    mimetype='application/json'
-                )
+                return json_response(NO_VACANCIES, 400)
             tenant.house_id = house.id
             house.vacant_apartments -= 1
             if house.vacant_apartments == 0 and not hasattr(house, 'is_full'):
                 house.is_full = True
             session.commit()
-            return Response(
-                '{"message": "Tenant moved in successfully"}',
-                status=200,
-                mimetype='application/json'
-            )
+            house_list_cache.vacancy_changed(house, flipped=house.vacant_apartments == 0)
+            return json_response(TENANT_MOVED_IN, 200)
         except Exception as e:
             session.rollback()
-            return Response(
-                json.dumps({"message": "Error moving in tenant", "error": str(e)}),
-                status=500,
-                mimetype="application/json"
-            )
-        finally:
-            session.close()
+            return error_response("Error moving in tenant", e)
 
 class TenantMoveOutResource(Resource):
-    def post(self):
-        data = request.get_json()
-        session = SessionLocal()
+    @validated(MoveOut)
+    def post(self, data):
+        session = db_session
         try:
-            tenant = session.query(Tenant).get(data['tenant_id'])
+            tenant = session.query(Tenant).get(data.tenant_id)
             if not tenant or not tenant.house_id:
-                return Response(
-                    '{"message": "Tenant not assigned to a house"}',
-                    status=400,
-                    mimetype='application/json'
-                )
+                return json_response(TENANT_NOT_HOUSED, 400)
             last_payment = session.query(Payment).filter_by(tenant_id=tenant.id).order_by(Payment.date.desc()).first()
             if not last_payment:
-                return Response(
-                    '{"message": "Tenant has not paid rent"}',
-                    status=400,
-                    mimetype='application/json'
-                )
+                return json_response(RENT_NOT_PAID, 400)
             house = session.query(House).get(tenant.house_id)
             house.vacant_apartments += 1
             tenant.house_id = None
             if house.vacant_apartments > 0 and hasattr(house, 'is_full'):
                 house.is_full = False
             session.commit()
-            return Response(
-                '{"message": "Tenant moved out successfully"}',
-                status=200,
-                mimetype='application/json'
-            )
+            house_list_cache.vacancy_changed(house, flipped=house.vacant_apartments == 1)
+            return json_response(TENANT_MOVED_OUT, 200)
         except Exception as e:
             session.rollback()
-            return Response(
-                json.dumps({"message": "Error moving out tenant", "error": str(e)}),
-                status=500,
-                mimetype="application/json"
-            )
-        finally:
-            session.close()
+            return error_response("Error moving out tenant", e)
 
 class RentPaymentResource(Resource):
-    def post(self):
-        data = request.get_json()
-        session = SessionLocal()
+    @validated(RentPayment)
+    def post(self, data):
+        session = db_session
         try:
-            tenant = session.query(Tenant).get(data['tenant_id'])
+            tenant = session.query(Tenant).get(data.tenant_id)
             if not tenant or not tenant.house_id:
-                return Response(
-                    '{"message": "Tenant not assigned to a house"}',
-                    status=400,
-                    mimetype='application/json'
-                )
+                return json_response(TENANT_NOT_HOUSED, 400)
             current_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            existing_payment = session.query(Payment).filter(
+            # Partial payments can be topped up until the month's rent is covered
+            paid_this_month = session.query(func.coalesce(func.sum(Payment.amount), 0.0)).filter(
                 Payment.tenant_id == tenant.id,
                 Payment.date >= current_month
-            ).first()
-            if existing_payment:
-                return Response(
-                    '{"message": "Rent already paid for this month"}',
-                    status=400,
-                    mimetype='application/json'
-                )
-            new_payment = Payment(amount=data['amount'], tenant_id=tenant.id)
+            ).scalar()
+            rent_price = session.query(House.rent_price).filter(House.id == tenant.house_id).scalar()
+            if rent_price is not None and paid_this_month >= rent_price:
+                return json_response(RENT_ALREADY_PAID, 400)
+            new_payment = Payment(amount=data.amount, tenant_id=tenant.id)
             session.add(new_payment)
             session.commit()
-            return Response(
-                '{"message": "Rent payment recorded successfully"}',
-                status=200,
-                mimetype='application/json'
-            )
+            return json_response(RENT_PAYMENT_RECORDED, 200)
         except Exception as e:
             session.rollback()
-            return Response(
-                json.dumps({"message": "Error recording rent payment", "error": str(e)}),
-                status=500,
-                mimetype="application/json"
-            )
-        finally:
-            session.close()
+            return error_response("Error recording rent payment", e)
 
 class ComplaintResource(Resource):
     def get(self):
-        session = SessionLocal()
+        session = db_session
         house_id = request.args.get('house_id')
         try:
-            if house_id:
-                # Join Complaint and Tenant so that only complaints for tenants in this house are returned
-                complaints = session.query(Complaint).join(Tenant, Complaint.tenant_id == Tenant.id).filter(Tenant.house_id == house_id).all()
-            else:
-                complaints = session.query(Complaint).all()
-            complaint_list = [
-                {
-                    "id": complaint.id,
-                    "description": complaint.description,
-                    "status": complaint.status,
-                    "tenant_id": complaint.tenant_id
-                }
-                for complaint in complaints
-            ]
-            response_data = json.dumps({"complaints": complaint_list})
-            return Response(response_data, status=200, mimetype="application/json")
+            fields = _requested_fields(COMPLAINT_FIELDS)
+        except ValueError as e:
+            return _invalid_fields(e)
+        try:
+            # Filtering by house joins tenants, so their moves change the result too
+            etag = table_etag(session, ("complaints", "tenants") if house_id else ("complaints",), request.query_string)
+            if request.if_none_match.contains_weak(etag):
+                return not_modified(etag)
+            # When house_id is given, only complaints from tenants of that house are returned
+            response = _stream_rows("complaints", fields, complaints_select(fields, bool(house_id)), {"house_id": house_id})
+            response.set_etag(etag, weak=True)
+            return response
         except Exception as e:
             session.rollback()
-            return Response(json.dumps({"message": "Error fetching complaints", "error": str(e)}), status=500, mimetype="application/json")
-        finally:
-            session.close()
-
-    def post(self):
-        data = request.get_json()
-        if not data.get('tenant_id') or not data.get('complaint'):
-            return Response('{"message": "Missing required fields"}', status=400, mimetype='application/json')
-        session = SessionLocal()
+            return error_response("Error fetching complaints", e)
+
+    @validated(NewComplaint)
+    def post(self, data):
+        session = db_session
         try:
-            tenant = session.query(Tenant).get(data['tenant_id'])
+            tenant = session.query(Tenant).get(data.tenant_id)
             if not tenant:
-                return Response('{"message": "Tenant not found"}', status=404, mimetype='application/json')
-            new_complaint = Complaint(tenant_id=data['tenant_id'], description=data['complaint'])
+                return json_response(TENANT_NOT_FOUND, 404)
+            new_complaint = Complaint(tenant_id=data.tenant_id, description=data.complaint)
             session.add(new_complaint)
             session.commit()
-            return Response('{"message": "Complaint submitted successfully"}', status=201, mimetype='application/json')
+            return json_response(COMPLAINT_SUBMITTED, 201)
         except Exception as e:
             session.rollback()
-            return Response(json.dumps({"message": "Error submitting complaint", "error": str(e)}), status=500, mimetype="application/json")
-        finally:
-            session.close()
+            return error_response("Error submitting complaint", e)
 
 class ComplaintStatusUpdateResource(Resource):
-    def post(self):
-        data = request.get_json()
-        if not data.get('complaint_id') or not data.get('status'):
-            return Response('{"message": "Missing required fields"}', status=400, mimetype='application/json')
-        session = SessionLocal()
+    @validated(ComplaintStatus)
+    def post(self, data):
+        session = db_session
         try:
-            complaint = session.query(Complaint).get(data['complaint_id'])
+            complaint = session.query(Complaint).get(data.complaint_id)
             if not complaint:
-                return Response('{"message": "Complaint not found"}', status=404, mimetype='application/json')
-            complaint.status = data['status']
+                return json_response(COMPLAINT_NOT_FOUND, 404)
+            complaint.status = data.status
             session.commit()
-            return Response('{"message": "Complaint status updated successfully"}', status=200, mimetype='application/json')
+            return json_response(COMPLAINT_STATUS_UPDATED, 200)
         except Exception as e:
             session.rollback()
-            return Response(json.dumps({"message": "Error updating complaint status", "error": str(e)}), status=500, mimetype="application/json")
-        finally:
-            session.close()
+            return error_response("Error updating complaint status", e)
 
 class TenantResource(Resource):
     def get(self):
-        session = SessionLocal()
+        session = db_session
         house_id = request.args.get('house_id')
         try:
-            if house_id:
-                # Query tenants based on house_id
-                tenants = session.query(Tenant).filter(Tenant.house_id == house_id).all()
-            else:
-                # If no house_id provided, fetch all tenants
-                tenants = session.query(Tenant).all()
-
-            tenant_list = [
-                {
-                    "id": tenant.id,
-                    "name": tenant.name,
-                    "email": tenant.email,
-                    "house_id": tenant.house_id
-                }
-                for tenant in tenants
-            ]
-            response_data = json.dumps({"tenants": tenant_list})
-            return Response(response_data, status=200, mimetype="application/json")
+            fields = _requested_fields(TENANT_FIELDS)
+        except ValueError as e:
+            return _invalid_fields(e)
+        try:
+            etag = table_etag(session, ("tenants",), request.query_string)
+            if request.if_none_match.contains_weak(etag):
+                return not_modified(etag)
+            # All tenants, or only those of house_id when given
+            response = _stream_rows("tenants", fields, tenants_select(fields, bool(house_id)), {"house_id": house_id})
+            response.set_etag(etag, weak=True)
+            return response
         except Exception as e:
             session.rollback()
-            return Response(
-                json.dumps({"message": "Error fetching tenants", "error": str(e)}),
-                status=500,
-                mimetype="application/json"
-            )
-        finally:
-            session.close()
+            return error_response("Error fetching tenants", e)
+
+# Longest range /rent-status will compute in one request
+MAX_RENT_STATUS_MONTHS = 36
+INVALID_PERIOD_RANGE = message(f"Period range must cover 1 to {MAX_RENT_STATUS_MONTHS} months")
+
+def _parse_month(value):
+    return datetime.strptime(value, '%Y-%m')
+
+def _add_months(month_start, count):
+    months = month_start.year * 12 + month_start.month - 1 + count
+    return month_start.replace(year=months // 12, month=months % 12 + 1)
+
+def _month_bucket(session, column):
+    # 'YYYY-MM' label for a datetime column, so payments can be grouped per month in SQL
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return func.to_char(column, 'YYYY-MM')
+    if dialect in ('mysql', 'mariadb'):
+        return func.date_format(column, '%Y-%m')
+    return func.strftime('%Y-%m', column)
+
+def _month_status(rent_price, amount_paid):
+    # Tenants without a house owe nothing; they get their own status so that
+    # ?payment_status=paid only lists tenants who actually paid rent
+    if rent_price is None:
+        return "not_housed", 0.0
+    if not amount_paid:
+        return "unpaid", rent_price
+    if amount_paid >= rent_price:
+        return "paid", 0.0
+    return "partial", rent_price - amount_paid
 
 class RentStatusResource(Resource):
     def get(self):
-        session = SessionLocal()
+        session = db_session
         house_id = request.args.get('house_id')  # Optional: filter by house
-        payment_status = request.args.get('payment_status')  # Optional: filter by payment status (paid/unpaid)
+        landlord_id = request.args.get('landlord_id')  # Optional: filter by landlord
+        payment_status = request.args.get('payment_status')  # Optional: paid/partial/unpaid/not_housed for the last month
+        # Optional: a single month (period=YYYY-MM) or a range (from=YYYY-MM&to=YYYY-MM); defaults to this month
+        period = request.args.get('period')
+        first = request.args.get('from') or period
+        last = request.args.get('to') or period
 
         try:
-            # Query all tenants with their payments
-            query = session.query(Tenant).join(Payment, Tenant.id == Payment.tenant_id, isouter=True)
+            fields = _requested_fields(RENT_STATUS_FIELDS)
+        except ValueError as e:
+            return _invalid_fields(e)
+        try:
+            this_month = datetime.utcnow().strftime('%Y-%m')
+            start = _parse_month(first or last or this_month)
+            end = _parse_month(last or first or this_month)
+        except ValueError:
+            return json_response(INVALID_PERIOD, 400)
+        month_count = (end.year - start.year) * 12 + end.month - start.month + 1
+        if month_count < 1 or month_count > MAX_RENT_STATUS_MONTHS:
+            return json_response(INVALID_PERIOD_RANGE, 400)
+        months = [_add_months(start, i).strftime('%Y-%m') for i in range(month_count)]
 
-            # Filter by house_id if provided
-            if house_id:
-                query = query.filter(Tenant.house_id == house_id)
+        try:
+            # The resolved range is part of the tag, so the default period rolls over with the month
+            etag = table_etag(session, ("tenants", "houses", "payments"), request.query_string, months[0], months[-1])
+            if request.if_none_match.contains_weak(etag):
+                return not_modified(etag)
 
-            # Filter tenants by payment_status if provided
-            if payment_status:
-                if payment_status.lower() == 'paid':
-                    # Filter tenants who have at least one payment
-                    query = query.filter(Payment.tenant_id.isnot(None))
-                elif payment_status.lower() == 'unpaid':
-                    # Filter tenants who have no payments
-                    query = query.filter(Payment.tenant_id.is_(None))
+            tenants = session.query(
+                Tenant.id, Tenant.name, Tenant.email, Tenant.house_id, House.rent_price
+            ).outerjoin(House, Tenant.house_id == House.id)
+            if house_id:
+                tenants = tenants.filter(Tenant.house_id == house_id)
+            if landlord_id:
+                tenants = tenants.filter(House.landlord_id == landlord_id)
 
-            tenants = query.all()
+            # All payments in the range, summed per tenant and month in a single grouped pass
+            month = _month_bucket(session, Payment.date)
+            totals = session.query(
+                Payment.tenant_id, month.label('month'), func.sum(Payment.amount).label('amount')
+            ).join(Tenant, Payment.tenant_id == Tenant.id).filter(
+                Payment.date >= start,
+                Payment.date < _add_months(end, 1)
+            )
+            if house_id:
+                totals = totals.filter(Tenant.house_id == house_id)
+            if landlord_id:
+                totals = totals.join(House, Tenant.house_id == House.id).filter(House.landlord_id == landlord_id)
+            paid = {(row.tenant_id, row.month): row.amount for row in totals.group_by(Payment.tenant_id, month)}
 
             tenant_list = []
-            for tenant in tenants:
-                # Check if a payment exists for the tenant
-                payment = session.query(Payment).filter(Payment.tenant_id == tenant.id).first()
-
-                # If a payment exists, tenant is marked as 'paid', else 'unpaid'
-                payment_status = "paid" if payment else "unpaid"
-
-                tenant_list.append({
+            for tenant in tenants.order_by(Tenant.id):
+                # Move-in dates aren't recorded, so every month in the range is billed
+                monthly = []
+                for label in months:
+                    amount_paid = paid.get((tenant.id, label), 0.0)
+                    status, arrears = _month_status(tenant.rent_price, amount_paid)
+                    monthly.append({
+                        "month": label,
+                        "amount_paid": amount_paid,
+                        "arrears": arrears,
+                        "payment_status": status
+                    })
+                latest_status = monthly[-1]["payment_status"]
+                if payment_status and latest_status != payment_status.lower():
+                    continue
+                entry = {
                     "id": tenant.id,
                     "name": tenant.name,
                     "email": tenant.email,
                     "house_id": tenant.house_id,
-                    "payment_status": payment_status
-                })
+                    "rent_price": tenant.rent_price,
+                    "payment_status": latest_status,
+                    "amount_paid": sum(m["amount_paid"] for m in monthly),
+                    "arrears": sum(m["arrears"] for m in monthly),
+                    "months": monthly
+                }
+                tenant_list.append({name: entry[name] for name in fields})
 
-            response_data = json.dumps({"tenants": tenant_list})
-            return Response(response_data, status=200, mimetype="application/json")
+            response = json_response({"from": months[0], "to": months[-1], "tenants": tenant_list})
+            response.set_etag(etag, weak=True)
+            return response
         
         except Exception as e:
             session.rollback()
-            return Response(
-                json.dumps({"message": "Error fetching rent status", "error": str(e)}),
-                status=500,
-                mimetype="application/json"
+            return error_response("Error fetching rent status", e)
+
+
+# ---------------------------
+# Landlord Dashboard
+# ---------------------------
+LANDLORD_NOT_FOUND = message("Landlord not found")
+
+# Complaints count as open until they are marked Resolved
+OPEN_COMPLAINT = func.coalesce(Complaint.status, 'Pending') != 'Resolved'
+
+class LandlordDashboardResource(Resource):
+    def get(self, landlord_id):
+        """Every house of a landlord with occupancy, tenants, this month's rent and open complaints.
+
+        Four grouped queries cover all houses, so the cost does not grow with
+        the number of houses the way per-house /tenants, /complaints and
+        /rent-status calls do.
+        """
+        session = db_session
+        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        try:
+            etag = table_etag(
+                session, ("houses", "tenants", "payments", "complaints"), landlord_id, month_start.isoformat()
+            )
+            if request.if_none_match.contains_weak(etag):
+                return not_modified(etag)
+
+            # The outer join tells an unknown landlord apart from one without houses
+            houses = session.query(
+                Landlord.id.label('landlord_id'), House.id, House.address, House.rent_price,
+                House.num_apartments, House.vacant_apartments
+            ).outerjoin(House, House.landlord_id == Landlord.id).filter(
+                Landlord.id == landlord_id
+            ).order_by(House.id).all()
+            if not houses:
+                return json_response(LANDLORD_NOT_FOUND, 404)
+            houses = [house for house in houses if house.id is not None]
+
+            tenant_counts = dict(
+                session.query(Tenant.house_id, func.count(Tenant.id))
+                .join(House, Tenant.house_id == House.id)
+                .filter(House.landlord_id == landlord_id)
+                .group_by(Tenant.house_id)
             )
-        finally:
-            session.close()
+            # Payments are attributed to the house the tenant currently lives in
+            collected = {
+                row.house_id: row
+                for row in session.query(
+                    Tenant.house_id,
+                    func.sum(Payment.amount).label('amount'),
+                    func.count(func.distinct(Payment.tenant_id)).label('tenants_paid')
+                ).join(Tenant, Payment.tenant_id == Tenant.id)
+                .join(House, Tenant.house_id == House.id)
+                .filter(House.landlord_id == landlord_id, Payment.date >= month_start)
+                .group_by(Tenant.house_id)
+            }
+            open_complaints = dict(
+                session.query(Tenant.house_id, func.count(Complaint.id))
+                .join(Tenant, Complaint.tenant_id == Tenant.id)
+                .join(House, Tenant.house_id == House.id)
+                .filter(House.landlord_id == landlord_id, OPEN_COMPLAINT)
+                .group_by(Tenant.house_id)
+            )
+
+            house_list = []
+            for house in houses:
+                occupied = house.num_apartments - house.vacant_apartments
+                tenant_count = tenant_counts.get(house.id, 0)
+                paid = collected.get(house.id)
+                house_list.append({
+                    "id": house.id,
+                    "address": house.address,
+                    "rent_price": house.rent_price,
+                    "num_apartments": house.num_apartments,
+                    "occupied_apartments": occupied,
+                    "vacant_apartments": house.vacant_apartments,
+                    "occupancy_rate": round(occupied / house.num_apartments, 4) if house.num_apartments else 0.0,
+                    "tenant_count": tenant_count,
+                    "tenants_paid": paid.tenants_paid if paid else 0,
+                    "rent_due": tenant_count * house.rent_price,
+                    "rent_collected": paid.amount if paid else 0.0,
+                    "open_complaints": open_complaints.get(house.id, 0)
+                })
 
+            apartments = sum(house["num_apartments"] for house in house_list)
+            occupied = sum(house["occupied_apartments"] for house in house_list)
+            response = json_response({
+                "landlord_id": landlord_id,
+                "month": month_start.strftime('%Y-%m'),
+                "totals": {
+                    "houses": len(house_list),
+                    "apartments": apartments,
+                    "occupied_apartments": occupied,
+                    "occupancy_rate": round(occupied / apartments, 4) if apartments else 0.0,
+                    "tenant_count": sum(house["tenant_count"] for house in house_list),
+                    "rent_due": sum((house["rent_due"] for house in house_list), 0.0),
+                    "rent_collected": sum((house["rent_collected"] for house in house_list), 0.0),
+                    "open_complaints": sum(house["open_complaints"] for house in house_list)
+                },
+                "houses": house_list
+            })
+            response.set_etag(etag, weak=True)
+            return response
+        except Exception as e:
+            session.rollback()
+            return error_response("Error fetching landlord dashboard", e)
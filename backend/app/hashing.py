@@ -0,0 +1,137 @@
+# app/hashing.py
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from .config import settings
+from .metrics import metrics
+from .utils import SessionLocal
+
+class PasswordPoolBusy(Exception):
+    """Raised when the hashing queue is full and the request should be shed."""
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the
+# request threads while capping how many CPUs auth traffic can occupy.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_POOL_SIZE,
+    thread_name_prefix="password-hash"
+)
+
+# Admission control: at most POOL_SIZE jobs running plus QUEUE_DEPTH waiting,
+# capped so that callers blocked in _run() leave half the server's request
+# threads free for everything else.
+_admission_limit = max(1, min(
+    settings.PASSWORD_POOL_SIZE + settings.PASSWORD_QUEUE_DEPTH,
+    settings.SERVER_THREADS // 2
+))
+_slots = threading.BoundedSemaphore(_admission_limit)
+metrics.set("password.admission_limit", _admission_limit)
+
+# Work factor used for new hashes; replaced by calibrate_work_factor() at startup
+_rounds = 12
+
+def _submit(name, fn, *args):
+    if not _slots.acquire(blocking=False):
+        metrics.incr("password.rejected")
+        raise PasswordPoolBusy()
+    submitted = time.perf_counter()
+
+    def job():
+        started = time.perf_counter()
+        metrics.observe("password.queue_wait", started - submitted)
+        try:
+            return fn(*args)
+        finally:
+            metrics.observe(f"password.{name}", time.perf_counter() - started)
+
+    try:
+        future = _executor.submit(job)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+def _run(name, fn, *args):
+    return _submit(name, fn, *args).result()
+
+def _time_hash(rounds):
+    started = time.perf_counter()
+    bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds))
+    return time.perf_counter() - started
+
+def calibrate_work_factor():
+    """Pick the bcrypt cost for new hashes and return it.
+
+    Each extra round doubles the hashing time, so we step up from
+    BCRYPT_MIN_ROUNDS while the next cost should still fit the budget.
+    """
+    global _rounds
+    if settings.BCRYPT_ROUNDS:
+        _rounds = int(settings.BCRYPT_ROUNDS)
+    else:
+        budget = settings.BCRYPT_TARGET_MS / 1000.0
+        rounds = settings.BCRYPT_MIN_ROUNDS
+        elapsed = _time_hash(rounds)
+        while rounds < settings.BCRYPT_MAX_ROUNDS and elapsed * 2 <= budget:
+            next_elapsed = _time_hash(rounds + 1)
+            if next_elapsed > budget:
+                break
+            rounds += 1
+            elapsed = next_elapsed
+        _rounds = rounds
+        metrics.set("password.calibrated_ms", round(elapsed * 1000.0, 2))
+    metrics.set("password.rounds", _rounds)
+    return _rounds
+
+def hash_password(password):
+    """Hash a plaintext password on the worker pool and return it as a str."""
+    hashed = _run("hash", bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(_rounds))
+    return hashed.decode('utf-8')
+
+def check_password(password, hashed):
+    """Verify a plaintext password against a stored bcrypt hash on the worker pool."""
+    return _run("check", bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+def needs_rehash(hashed):
+    """Return True if a stored hash was made with a lower cost than the current one.
+
+    Workers calibrate independently and may settle on different costs; only
+    ever upgrading keeps them from rehashing each other's hashes back and
+    forth. Set BCRYPT_ROUNDS to pin one cost across all workers.
+    """
+    try:
+        # bcrypt hashes look like $2b$12$<salt+digest>
+        return int(hashed.split('$')[2]) < _rounds
+    except (IndexError, ValueError):
+        return False
+
+def schedule_rehash(model, row_id, password, old_hash):
+    """Rehash a just-verified password at the current cost without blocking the login.
+
+    The update only applies if the stored hash is still the one we verified,
+    so a concurrent password change is never overwritten. If the pool is busy
+    the rehash is skipped; it will be retried on the next login.
+    """
+    def rehash():
+        new_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(_rounds)).decode('utf-8')
+        session = SessionLocal()
+        try:
+            session.query(model).filter(model.id == row_id, model.password == old_hash).update(
+                {"password": new_hash}, synchronize_session=False
+            )
+            session.commit()
+        except Exception:
+            session.rollback()
+            print("Error rehashing password:", traceback.format_exc())
+        finally:
+            session.close()
+
+    try:
+        _submit("rehash", rehash)
+        metrics.incr("password.rehash_scheduled")
+    except PasswordPoolBusy:
+        pass
@@ -0,0 +1,96 @@
+# app/house_cache.py
+import threading
+from collections import namedtuple
+
+from .cache import LRUCache
+from .config import settings
+from .metrics import metrics
+from .singleflight import SingleFlight
+
+# One encoded /houses page, with its compressed `variants` by encoding, plus what is
+# needed to tell whether a write touches it: the ids on the page, its filters,
+# and the (sort key, id) range it covers.
+# `after` is the cursor position the page starts after (None for the first page);
+# `last` is the position of its last row, or None when it is the final page.
+CachedPage = namedtuple('CachedPage', [
+    'body', 'variants', 'ids', 'sort', 'landlord_id', 'min_price', 'max_price', 'vacant_only', 'searched', 'after', 'last'
+])
+
+def _could_include(page, house):
+    """True if `house` satisfies the page's filters and sorts into its range."""
+    if page.landlord_id is not None and house.landlord_id != page.landlord_id:
+        return False
+    if page.min_price is not None and house.rent_price < page.min_price:
+        return False
+    if page.max_price is not None and house.rent_price > page.max_price:
+        return False
+    if page.searched:
+        # Address matches and relevance are computed by the database
+        return True
+    position = (house.id if page.sort == 'id' else house.rent_price, house.id)
+    if page.after is not None and position <= page.after:
+        return False
+    return page.last is None or position <= page.last
+
+def _page_size(page):
+    return len(page.body) + sum(len(variant) for variant in page.variants.values())
+
+class HouseListCache:
+    """Encoded /houses pages keyed by their normalized query parameters.
+
+    Pages are dropped precisely when a house write could change them: a new
+    house invalidates the pages it would appear on, and a vacancy change
+    invalidates pages showing that house plus, when the house gained or
+    lost its last vacancy, the vacant_only pages it would enter or leave.
+    The TTL only bounds staleness from writes made by other processes.
+    """
+
+    def __init__(self, maxsize, max_bytes, ttl):
+        self._pages = LRUCache(
+            maxsize, ttl=ttl, name="houses.cache", max_bytes=max_bytes, sizeof=_page_size
+        )
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def generation(self):
+        """Token to pass to set(); read it before querying the database."""
+        return self._generation
+
+    def get(self, key):
+        return self._pages.get(key)
+
+    def set(self, key, page, generation):
+        with self._lock:
+            # A write committed while this page was being built may be missing from it
+            if generation != self._generation:
+                metrics.incr("houses.cache.stale_fills")
+                return
+            self._pages.set(key, page)
+
+    def house_added(self, house):
+        self._invalidate(lambda page: _could_include(page, house))
+
+    def vacancy_changed(self, house, flipped):
+        """Drop pages affected by a change to `house.vacant_apartments`.
+
+        `flipped` is True when the house went from or to zero vacancies.
+        """
+        self._invalidate(lambda page: house.id in page.ids or (
+            flipped and page.vacant_only and _could_include(page, house)
+        ))
+
+    def clear(self):
+        self._invalidate(lambda page: True)
+
+    def _invalidate(self, predicate):
+        with self._lock:
+            self._generation += 1
+            dropped = self._pages.discard(predicate)
+        metrics.incr("houses.cache.invalidated", dropped)
+
+house_list_cache = HouseListCache(
+    settings.HOUSES_CACHE_SIZE, settings.HOUSES_CACHE_MAX_BYTES, settings.HOUSES_CACHE_TTL
+)
+
+# Concurrent misses for the same page share one query and one encoded body
+house_page_flights = SingleFlight("houses.flights")
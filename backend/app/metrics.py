@@ -0,0 +1,37 @@
+# app/metrics.py
+import threading
+
+class Metrics:
+    """In-process counters and timings, exposed as JSON on /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timings = {}
+        self._gauges = {}
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            timing = self._timings.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            ms = seconds * 1000.0
+            timing["count"] += 1
+            timing["total_ms"] += ms
+            if ms > timing["max_ms"]:
+                timing["max_ms"] = ms
+
+    def snapshot(self):
+        with self._lock:
+            timings = {}
+            for name, timing in self._timings.items():
+                timings[name] = dict(timing, avg_ms=timing["total_ms"] / timing["count"])
+            return {"counters": dict(self._counters), "gauges": dict(self._gauges), "timings": timings}
+
+metrics = Metrics()
@@ -1,11 +1,11 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .utils import Base  # Ensure this points to your Base definition
 
 class Landlord(Base):
     __tablename__ = 'landlords'
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     email = Column(String(100), unique=True, nullable=False)
     password = Column(String(100), nullable=False)
@@ -15,11 +15,11 @@ class Landlord(Base):
 
 class Tenant(Base):
     __tablename__ = 'tenants'
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     email = Column(String(100), unique=True, nullable=False)
     password = Column(String(100), nullable=False)
-    house_id = Column(Integer, ForeignKey('houses.id'), nullable=True)
+    house_id = Column(Integer, ForeignKey('houses.id'), nullable=True, index=True)
     
     # Relationships to Payment and Complaint models
     payments = relationship('Payment', back_populates='tenant')
@@ -30,11 +30,19 @@ class Tenant(Base):
 
 class House(Base):
     __tablename__ = 'houses'
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        # Vacancy search ("vacant houses, cheapest first"); only rows with vacancies are indexed
+        Index(
+            'ix_houses_vacant_rent_price', 'rent_price', 'id',
+            sqlite_where=text('vacant_apartments > 0'),
+            postgresql_where=text('vacant_apartments > 0')
+        ),
+    )
+    id = Column(Integer, primary_key=True)
     address = Column(String(200), nullable=False)
     num_apartments = Column(Integer, nullable=False)
-    rent_price = Column(Float, nullable=False)
-    landlord_id = Column(Integer, ForeignKey('landlords.id'), nullable=False)
+    rent_price = Column(Float, nullable=False, index=True)
+    landlord_id = Column(Integer, ForeignKey('landlords.id'), nullable=False, index=True)
     vacant_apartments = Column(Integer, nullable=False)
     
     # Relationships to Landlord and Tenant models
@@ -43,7 +51,7 @@ class House(Base):
 
 class Payment(Base):
     __tablename__ = 'payments'
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     amount = Column(Float, nullable=False)
     date = Column(DateTime, default=datetime.utcnow)
     tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=False)
@@ -51,12 +59,31 @@ class Payment(Base):
     # Back-populate relationship to Tenant
     tenant = relationship('Tenant', back_populates='payments')
 
+# Serves both "payments for a tenant" and "latest payment for a tenant"
+Index('ix_payments_tenant_id_date', Payment.tenant_id, Payment.date.desc())
+
 class Complaint(Base):
     __tablename__ = 'complaints'
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     description = Column(String(500), nullable=False)
     status = Column(String(50), default='Pending')
-    tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=False)
+    tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=False, index=True)
     
     # Back-populate relationship to Tenant
     tenant = relationship('Tenant', back_populates='complaints')
+
+class RefreshToken(Base):
+    __tablename__ = 'refresh_tokens'
+    id = Column(Integer, primary_key=True)
+    # HMAC-SHA256 of the secret half of the token; the raw token is never stored
+    token_hash = Column(String(64), nullable=False)
+    landlord_id = Column(Integer, ForeignKey('landlords.id'), nullable=True, index=True)
+    tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=True, index=True)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class TableVersion(Base):
+    __tablename__ = 'table_versions'
+    # Incremented in the same transaction as every write to the table (see app/versions.py)
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,122 @@
+# app/queries.py
+"""Prebuilt Core statements for the hot list endpoints.
+
+Each builder returns the same select() object for the same shape of request
+(selected fields plus which optional filters are present); the values travel
+as bound parameters. SQLAlchemy's compiled cache therefore hits on every call,
+and executing through a Connection returns plain row tuples without ORM
+identity-map bookkeeping.
+"""
+from functools import lru_cache
+
+from sqlalchemy import Integer, and_, bindparam, literal_column, or_, select
+
+from .models import House, Tenant, Complaint
+from .search import address_match_subquery
+
+houses = House.__table__
+tenants = Tenant.__table__
+complaints = Complaint.__table__
+
+# Serializable fields of each list endpoint; never includes password hashes
+HOUSE_FIELDS = {
+    "id": houses.c.id,
+    "address": houses.c.address,
+    "num_apartments": houses.c.num_apartments,
+    "rent_price": houses.c.rent_price,
+    "landlord_id": houses.c.landlord_id,
+    "vacant_apartments": houses.c.vacant_apartments,
+}
+
+TENANT_FIELDS = {
+    "id": tenants.c.id,
+    "name": tenants.c.name,
+    "email": tenants.c.email,
+    "house_id": tenants.c.house_id,
+}
+
+COMPLAINT_FIELDS = {
+    "id": complaints.c.id,
+    "description": complaints.c.description,
+    "status": complaints.c.status,
+    "tenant_id": complaints.c.tenant_id,
+}
+
+# Orderings /houses can page through; houses.id breaks ties so keys are unique
+HOUSE_SORT_KEYS = {
+    "id": houses.c.id,
+    "rent_price": houses.c.rent_price,
+}
+
+def _columns(field_map, fields):
+    return [field_map[name].label(name) for name in fields]
+
+@lru_cache(maxsize=None)
+def tenants_select(fields, by_house):
+    """Tenants with the given fields; binds :house_id when `by_house`."""
+    stmt = select(*_columns(TENANT_FIELDS, fields))
+    if by_house:
+        stmt = stmt.where(tenants.c.house_id == bindparam('house_id'))
+    return stmt
+
+@lru_cache(maxsize=None)
+def complaints_select(fields, by_house):
+    """Complaints with the given fields; binds :house_id (via the tenant) when `by_house`."""
+    stmt = select(*_columns(COMPLAINT_FIELDS, fields))
+    if by_house:
+        stmt = stmt.join(tenants, complaints.c.tenant_id == tenants.c.id).where(
+            tenants.c.house_id == bindparam('house_id')
+        )
+    return stmt
+
+@lru_cache(maxsize=1024)
+def houses_select(fields, sort, search, landlord, min_price, max_price, vacant_only, after):
+    """One keyset page of /houses.
+
+    `search` is the dialect name when matching through the address search
+    index, 'ilike' for the substring fallback, or None. The boolean flags say
+    which of :landlord_id, :min_price, :max_price and the cursor's
+    :last_key/:last_id are bound; :limit is always bound. Rows carry the
+    requested fields plus sort_key and cursor_id for the next cursor.
+    """
+    matches = address_match_subquery(search) if search not in (None, 'ilike') else None
+    if sort == 'relevance':
+        # Without a search index every match is equally relevant
+        sort_column = matches.c.score if matches is not None else houses.c.id
+    else:
+        sort_column = HOUSE_SORT_KEYS[sort]
+
+    stmt = select(
+        *_columns(HOUSE_FIELDS, fields),
+        sort_column.label('sort_key'),
+        houses.c.id.label('cursor_id')
+    ).select_from(houses)
+    if matches is not None:
+        # Tokenized full-text match, ranked by relevance
+        stmt = stmt.join(matches, matches.c.house_id == houses.c.id)
+    elif search == 'ilike':
+        stmt = stmt.where(houses.c.address.ilike(bindparam('address_pattern')))
+    if landlord:
+        stmt = stmt.where(houses.c.landlord_id == bindparam('landlord_id'))
+    if min_price:
+        stmt = stmt.where(houses.c.rent_price >= bindparam('min_price'))
+    if max_price:
+        stmt = stmt.where(houses.c.rent_price <= bindparam('max_price'))
+    if vacant_only:
+        # A literal 0 matches ix_houses_vacant_rent_price's WHERE clause even
+        # under generic prepared plans, where a bound parameter would not.
+        stmt = stmt.where(houses.c.vacant_apartments > literal_column('0'))
+
+    # Keyset pagination: seek past the cursor's row instead of using OFFSET
+    if sort_column is houses.c.id:
+        if after:
+            stmt = stmt.where(houses.c.id > bindparam('last_id'))
+        stmt = stmt.order_by(houses.c.id)
+    else:
+        if after:
+            stmt = stmt.where(or_(
+                sort_column > bindparam('last_key'),
+                and_(sort_column == bindparam('last_key'), houses.c.id > bindparam('last_id'))
+            ))
+        stmt = stmt.order_by(sort_column, houses.c.id)
+    return stmt.limit(bindparam('limit', type_=Integer))
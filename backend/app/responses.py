@@ -0,0 +1,59 @@
+# app/responses.py
+"""JSON response helpers shared by every resource.
+
+Bodies are encoded with orjson when it is installed (it writes bytes
+directly and is several times faster than the json module) and with the
+standard library otherwise; both produce compact JSON. Static bodies should
+be built once with message() at import time and passed to json_response()
+as bytes, which are sent as they are.
+"""
+import json
+
+from flask import Response
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+if orjson is not None:
+    dumps = orjson.dumps
+else:
+    def dumps(payload):
+        return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+def message(text):
+    """Encode a {"message": text} body."""
+    return dumps({"message": text})
+
+def json_response(payload, status=200, headers=None):
+    """Return a JSON response; `payload` is encoded unless it is already bytes."""
+    body = payload if isinstance(payload, bytes) else dumps(payload)
+    return Response(body, status=status, mimetype='application/json', headers=headers)
+
+def not_modified(etag):
+    """Return a bodyless 304 carrying the weak `etag`."""
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    return response
+
+def error_response(text, error, status=500):
+    """Return {"message": text, "error": str(error)}, by default as a 500."""
+    return json_response({"message": text, "error": str(error)}, status)
+
+def stream_array(key, batches):
+    """Return a streamed {key: [...]} response from an iterable of lists of dicts.
+
+    Each batch is encoded and sent as one chunk, so only the current batch is
+    held in memory.
+    """
+    def generate():
+        yield b'{"%s":[' % key.encode('utf-8')
+        separator = b''
+        for batch in batches:
+            if batch:
+                yield separator + b','.join(dumps(item) for item in batch)
+                separator = b','
+        yield b']}'
+
+    return Response(generate(), status=200, mimetype='application/json')
@@ -0,0 +1,77 @@
+# app/schemas.py
+"""Request body schemas for the POST endpoints.
+
+Each handler decorated with @validated(Schema) receives the body already
+decoded into a typed Struct. The decoders are built once at import, decode
+the raw request bytes in one pass, and run in lax mode, so numbers sent as
+strings ("3", "1200.50") are coerced to the declared type. Any body that is
+not valid JSON or does not match the schema is answered with 422.
+"""
+import functools
+from typing import Annotated
+
+import msgspec
+from flask import request
+
+from .responses import error_response
+
+# Shared field constraints; string lengths match the column sizes in app.models
+Id = Annotated[int, msgspec.Meta(gt=0)]
+Name = Annotated[str, msgspec.Meta(min_length=1, max_length=100)]
+Email = Annotated[str, msgspec.Meta(min_length=1, max_length=100)]
+Password = Annotated[str, msgspec.Meta(min_length=1)]
+Money = Annotated[float, msgspec.Meta(gt=0)]
+
+class SignUp(msgspec.Struct):
+    name: Name
+    email: Email
+    password: Password
+
+class Login(msgspec.Struct):
+    email: Email
+    password: Password
+
+class TokenRefresh(msgspec.Struct):
+    refresh_token: Annotated[str, msgspec.Meta(min_length=1)]
+
+class NewHouse(msgspec.Struct):
+    address: Annotated[str, msgspec.Meta(min_length=1, max_length=200)]
+    num_apartments: Annotated[int, msgspec.Meta(gt=0)]
+    rent_price: Money
+    landlord_id: Id
+
+class MoveIn(msgspec.Struct):
+    tenant_id: Id
+    house_id: Id
+
+class MoveOut(msgspec.Struct):
+    tenant_id: Id
+
+class RentPayment(msgspec.Struct):
+    tenant_id: Id
+    amount: Money
+
+class NewComplaint(msgspec.Struct):
+    tenant_id: Id
+    complaint: Annotated[str, msgspec.Meta(min_length=1, max_length=500)]
+
+class ComplaintStatus(msgspec.Struct):
+    complaint_id: Id
+    status: Annotated[str, msgspec.Meta(min_length=1, max_length=50)]
+
+def validated(schema):
+    """Decorate a Resource method to receive the request body decoded as `schema`."""
+    decoder = msgspec.json.Decoder(schema, strict=False)
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                body = decoder.decode(request.get_data())
+            except msgspec.ValidationError as e:
+                return error_response("Invalid request body", e, 422)
+            except msgspec.DecodeError as e:
+                return error_response("Request body must be valid JSON", e, 422)
+            return method(self, body, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,170 @@
+# app/search.py
+import bisect
+import re
+import threading
+import time
+
+from sqlalchemy import String, bindparam, select, literal_column, text, func
+
+from .config import settings
+from .models import House
+
+# SQLite: an external-content FTS5 table over houses.address. The triggers keep
+# it in sync with every insert/update/delete on houses, including HouseResource.post.
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS houses_fts USING fts5("
+    "address, content='houses', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS houses_fts_ai AFTER INSERT ON houses BEGIN "
+    "INSERT INTO houses_fts(rowid, address) VALUES (new.id, new.address); END",
+    "CREATE TRIGGER IF NOT EXISTS houses_fts_ad AFTER DELETE ON houses BEGIN "
+    "INSERT INTO houses_fts(houses_fts, rowid, address) VALUES ('delete', old.id, old.address); END",
+    "CREATE TRIGGER IF NOT EXISTS houses_fts_au AFTER UPDATE OF address ON houses BEGIN "
+    "INSERT INTO houses_fts(houses_fts, rowid, address) VALUES ('delete', old.id, old.address); "
+    "INSERT INTO houses_fts(rowid, address) VALUES (new.id, new.address); END",
+]
+
+# PostgreSQL: a trigram GIN index, which serves word_similarity (<%) lookups directly
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_houses_address_trgm ON houses USING gin (address gin_trgm_ops)",
+]
+
+def ensure_search_index(engine):
+    """Create the address search index when missing (databases built with create_all).
+
+    Alembic revision 77db2db43852 creates the same objects for migrated databases.
+    """
+    dialect = engine.dialect.name
+    with engine.begin() as connection:
+        if dialect == 'sqlite':
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'houses_fts'")
+            ).first()
+            if exists:
+                return
+            for statement in SQLITE_SEARCH_DDL:
+                connection.execute(text(statement))
+            connection.execute(text("INSERT INTO houses_fts(houses_fts) VALUES ('rebuild')"))
+        elif dialect == 'postgresql':
+            for statement in POSTGRES_SEARCH_DDL:
+                connection.execute(text(statement))
+
+def _terms(query):
+    return re.findall(r'\w+', query.lower())
+
+def address_match_param(dialect, query):
+    """Return the :match parameter for address_match_subquery(), or None to fall back to ILIKE.
+
+    None means the database has no search index or `query` has no searchable words.
+    """
+    terms = _terms(query)
+    if not terms:
+        return None
+    if dialect == 'sqlite':
+        # Every word must match, the last one as a prefix so partial input still hits
+        return ' '.join(f'"{term}"' for term in terms) + '*'
+    if dialect == 'postgresql':
+        return ' '.join(terms)
+    return None
+
+def address_match_subquery(dialect):
+    """Subquery of (house_id, score) for houses matching the :match parameter; lower scores rank higher."""
+    if dialect == 'sqlite':
+        return select(
+            literal_column('houses_fts.rowid').label('house_id'),
+            literal_column('houses_fts.rank').label('score')
+        ).select_from(text('houses_fts')).where(
+            text('houses_fts MATCH :match')
+        ).subquery('address_matches')
+    houses = House.__table__
+    match = bindparam('match', type_=String)
+    return select(
+        houses.c.id.label('house_id'),
+        (-func.word_similarity(match, houses.c.address)).label('score')
+    ).where(match.op('<%')(houses.c.address)).subquery('address_matches')
+
+# ---------------------------
+# In-memory address autocomplete
+# ---------------------------
+class AddressPrefixIndex:
+    """Sorted (key, house_id) pairs answering address prefix lookups with bisect.
+
+    Every word of an address starts a key, so "kenya" suggests both
+    "Kenyatta Road" and "12 Kenyatta Avenue". The index is built from the
+    database on first use, updated in place as houses are added, and rebuilt
+    every SUGGEST_REFRESH_SECONDS to pick up houses added by other workers.
+    Only one request rebuilds at a time; while it does, the others keep
+    answering from the previous index.
+    """
+
+    def __init__(self, refresh_seconds):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._keys = []
+        self._addresses = {}
+        self._loaded_at = None
+
+    @staticmethod
+    def _entries(house_id, address):
+        words = _terms(address)
+        return [(' '.join(words[i:]), house_id) for i in range(len(words))]
+
+    def _is_stale(self):
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    def load(self, houses):
+        """Replace the index with `houses`, an iterable of (id, address) pairs."""
+        keys = []
+        addresses = {}
+        for house_id, address in houses:
+            keys.extend(self._entries(house_id, address))
+            addresses[house_id] = address
+        keys.sort()
+        with self._lock:
+            self._keys = keys
+            self._addresses = addresses
+            self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self, session):
+        if not self._is_stale():
+            return
+        if self._loaded_at is None:
+            # Nothing to serve yet, so wait for the first load
+            self._rebuild_lock.acquire()
+        elif not self._rebuild_lock.acquire(blocking=False):
+            return  # another request is rebuilding; the old index still answers
+        try:
+            if self._is_stale():
+                self.load(session.query(House.id, House.address))
+        finally:
+            self._rebuild_lock.release()
+
+    def add(self, house_id, address):
+        with self._lock:
+            if self._loaded_at is None:
+                return  # the first load will read it from the database
+            for entry in self._entries(house_id, address):
+                bisect.insort(self._keys, entry)
+            self._addresses[house_id] = address
+
+    def suggest(self, prefix, limit):
+        """Return up to `limit` {"id", "address"} dicts whose address has a word starting with `prefix`."""
+        prefix = ' '.join(_terms(prefix))
+        if not prefix:
+            return []
+        suggestions = []
+        seen = set()
+        with self._lock:
+            position = bisect.bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and len(suggestions) < limit:
+                key, house_id = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                if house_id not in seen:
+                    seen.add(house_id)
+                    suggestions.append({"id": house_id, "address": self._addresses[house_id]})
+                position += 1
+        return suggestions
+
+address_index = AddressPrefixIndex(settings.SUGGEST_REFRESH_SECONDS)
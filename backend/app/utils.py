@@ -1,16 +1,151 @@
 # app/utils.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+from flask import g, request, has_app_context, has_request_context
+import hashlib
+import threading
 
-# Database configuration
-SQLALCHEMY_DATABASE_URL = "sqlite:///./house_management.db"
+from .cache import LRUCache
+from .config import settings
+
+# Database configuration (SQLite by default, e.g. postgresql+psycopg2://... in production)
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+def _sqlite_pragmas(read_only):
+    # Runs once per pooled connection. WAL lets readers proceed while a writer
+    # commits, and busy_timeout makes writers wait instead of failing with
+    # "database is locked". A read-only replica can't change the journal mode.
+    def apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+    return apply
+
+def _sqlite_query_only(dbapi_connection, connection_record):
+    dbapi_connection.execute("PRAGMA query_only=ON")
+
+def build_engine(url, sqlite_performance=None, read_only=False):
+    """Create an engine for `url` using the pool options from app.config.Settings.
+
+    `sqlite_performance` overrides Settings.SQLITE_PERFORMANCE for SQLite URLs.
+    `read_only` makes every connection reject writes (used for the replica).
+    """
+    backend = make_url(url).get_backend_name()
+    connect_args = {}
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if backend == "sqlite":
+        # Connections are shared across Flask's worker threads; SQLite has no
+        # server-side statement timeout and keeps SQLAlchemy's default pool.
+        connect_args["check_same_thread"] = False
+    else:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+        if backend == "postgresql":
+            server_options = []
+            if settings.DB_STATEMENT_TIMEOUT_MS:
+                server_options.append(f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}")
+            if read_only:
+                server_options.append("-c default_transaction_read_only=on")
+            if server_options:
+                connect_args["options"] = " ".join(server_options)
+    engine = create_engine(url, connect_args=connect_args, **options)
+    if sqlite_performance is None:
+        sqlite_performance = settings.SQLITE_PERFORMANCE
+    if backend == "sqlite" and sqlite_performance:
+        event.listen(engine, "connect", _sqlite_pragmas(read_only))
+    if backend == "sqlite" and read_only:
+        event.listen(engine, "connect", _sqlite_query_only)
+    return engine
+
+_journal_modes = {}
+
+def cursor_blocks_writers(bind):
+    """True if an open read cursor on `bind` stops other connections from writing.
+
+    That is SQLite outside WAL mode: a reader holds a SHARED lock until its
+    cursor is exhausted, and writers fail with "database is locked" once
+    busy_timeout runs out. The journal mode is read once per engine.
+    """
+    if bind.dialect.name != 'sqlite':
+        return False
+    if bind not in _journal_modes:
+        with bind.connect() as connection:
+            _journal_modes[bind] = connection.exec_driver_sql("PRAGMA journal_mode").scalar().lower()
+    return _journal_modes[bind] != 'wal'
 
 # Create the database engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = build_engine(SQLALCHEMY_DATABASE_URL)
+
+# Optional read replica; without one every query goes to the primary engine
+if settings.READ_DATABASE_URL:
+    read_engine = build_engine(settings.READ_DATABASE_URL, read_only=True)
+else:
+    read_engine = engine
+
+# Clients that wrote recently, keyed by token digest or remote address. This is
+# per process, so a client load-balanced onto another worker may still see
+# replica lag within the sticky window.
+_recent_writers = LRUCache(100000, ttl=settings.READ_STICKY_SECONDS, name="replica.sticky")
+
+def _client_key():
+    auth = request.headers.get('Authorization')
+    if auth:
+        return hashlib.sha256(auth.encode('utf-8')).hexdigest()
+    return request.remote_addr
+
+def _reads_from_replica():
+    if not has_request_context() or request.method not in ('GET', 'HEAD'):
+        return False
+    return _recent_writers.get(_client_key()) is None
+
+class RoutingSession(Session):
+    """Session that sends GET requests to the read replica and everything else to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if read_engine is not engine and not self._flushing and _reads_from_replica():
+            return read_engine
+        return engine
+
+def mark_read_your_writes(response):
+    """after_request hook: pin a client to the primary for a short window after a write."""
+    if read_engine is not engine and request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+        _recent_writers.set(_client_key(), True)
+    return response
 
 # Create a SessionLocal class for database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
+def _session_scope():
+    # One session per Flask app context. Flask keeps its context in a
+    # ContextVar, so this is isolated per thread and per greenlet alike.
+    # Code running outside a request (scripts, background jobs) gets one
+    # session per thread and must call db_session.remove() itself.
+    if has_app_context():
+        return id(g._get_current_object())
+    return threading.get_ident()
+
+# Request-scoped session. It is only created the first time a handler uses it,
+# and the pool connection is only checked out on the first query, so endpoints
+# that never touch the DB never check out a connection.
+db_session = scoped_session(SessionLocal, scopefunc=_session_scope)
+
+def remove_db_session(exception=None):
+    """teardown_appcontext hook: close the request's session, rolling back uncommitted work."""
+    db_session.remove()
 
 # Base class for models
 Base = declarative_base()
@@ -21,4 +156,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,56 @@
+# app/versions.py
+"""Per-table write counters behind the ETags of the polled GET endpoints.
+
+Each flush bumps the version of every table it inserted into, updated or
+deleted from, inside the same transaction, so a reader sees a new version
+exactly when it can see the new rows. Bulk query.update()/delete() calls
+bump their table as well. Writes that bypass the ORM session must bump
+the version themselves.
+"""
+import hashlib
+
+from sqlalchemy import event, select, update
+
+from .models import Base, TableVersion
+from .utils import SessionLocal
+
+versions = TableVersion.__table__
+
+VERSIONED_TABLES = tuple(name for name in Base.metadata.tables if name != versions.name)
+
+def ensure_table_versions(engine):
+    """Insert a zero version for every table that has none yet (databases built with create_all)."""
+    with engine.begin() as connection:
+        existing = set(connection.execute(select(versions.c.name)).scalars())
+        missing = [{"name": name, "version": 0} for name in VERSIONED_TABLES if name not in existing]
+        if missing:
+            connection.execute(versions.insert(), missing)
+
+def _bump(connection, tables):
+    if tables:
+        connection.execute(
+            update(versions).where(versions.c.name.in_(sorted(tables))).values(version=versions.c.version + 1)
+        )
+
+@event.listens_for(SessionLocal, 'after_flush')
+def _bump_flushed_tables(session, flush_context):
+    tables = {obj.__table__.name for obj in session.new}
+    tables.update(obj.__table__.name for obj in session.deleted)
+    tables.update(obj.__table__.name for obj in session.dirty if session.is_modified(obj))
+    _bump(session.connection(), tables)
+
+@event.listens_for(SessionLocal, 'do_orm_execute')
+def _bump_bulk_writes(state):
+    if (state.is_update or state.is_delete) and state.bind_mapper is not None:
+        _bump(state.session.connection(bind_arguments=state.bind_arguments), {state.bind_mapper.local_table.name})
+
+def table_etag(session, tables, *scope):
+    """Weak ETag for a response built from `tables`.
+
+    One primary-key lookup of the tables' versions; `scope` holds everything
+    else the body depends on, such as the query string.
+    """
+    rows = session.execute(
+        select(versions.c.name, versions.c.version).where(versions.c.name.in_(tables)).order_by(versions.c.name)
+    ).all()
+    return hashlib.sha1(repr((rows, scope)).encode('utf-8')).hexdigest()
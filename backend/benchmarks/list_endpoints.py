@@ -0,0 +1,123 @@
+"""Rows per second for the list endpoints: ORM hydration vs the prebuilt Core statements.
+
+Run from the backend directory:
+
+    python -m benchmarks.list_endpoints --rows 50000 --repeat 5
+
+The ORM path is what the handlers used to do: load full mapped objects and
+copy their attributes into dicts. The Core path is what they do now: execute
+the cached select() from app.queries on a Connection and zip row tuples
+with the field names.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Landlord, House, Tenant, Complaint
+from app.queries import (
+    HOUSE_FIELDS, TENANT_FIELDS, COMPLAINT_FIELDS,
+    houses_select, tenants_select, complaints_select
+)
+from app.utils import build_engine
+
+def seed(engine, rows):
+    connection = engine.connect()
+    connection.execute(Landlord.__table__.insert(), [{"name": "Bench", "email": "bench@example.com", "password": "x"}])
+    connection.execute(House.__table__.insert(), [
+        {"address": f"{i} Bench Street", "num_apartments": 10, "rent_price": 500 + i % 300,
+         "landlord_id": 1, "vacant_apartments": i % 4}
+        for i in range(rows)
+    ])
+    connection.execute(Tenant.__table__.insert(), [
+        {"name": f"Tenant {i}", "email": f"t{i}@example.com", "password": "$2b$12$" + "x" * 53, "house_id": i % rows + 1}
+        for i in range(rows)
+    ])
+    connection.execute(Complaint.__table__.insert(), [
+        {"description": f"Complaint number {i} about the plumbing", "status": "Pending", "tenant_id": i % rows + 1}
+        for i in range(rows)
+    ])
+    connection.commit()
+    connection.close()
+
+def orm_houses(session):
+    return [
+        {
+            "id": house.id,
+            "address": house.address,
+            "num_apartments": house.num_apartments,
+            "rent_price": house.rent_price,
+            "landlord_id": house.landlord_id,
+            "vacant_apartments": house.vacant_apartments
+        }
+        for house in session.query(House).all()
+    ]
+
+def orm_tenants(session):
+    return [
+        {"id": tenant.id, "name": tenant.name, "email": tenant.email, "house_id": tenant.house_id}
+        for tenant in session.query(Tenant).all()
+    ]
+
+def orm_complaints(session):
+    return [
+        {"id": c.id, "description": c.description, "status": c.status, "tenant_id": c.tenant_id}
+        for c in session.query(Complaint).all()
+    ]
+
+def core_houses(session, rows):
+    fields = tuple(HOUSE_FIELDS)
+    stmt = houses_select(fields, 'id', None, False, False, False, False, False)
+    result = session.connection().execute(stmt, {"limit": rows})
+    return [dict(zip(fields, row)) for row in result]
+
+def core_tenants(session):
+    fields = tuple(TENANT_FIELDS)
+    result = session.connection().execute(tenants_select(fields, False))
+    return [dict(zip(fields, row)) for row in result]
+
+def core_complaints(session):
+    fields = tuple(COMPLAINT_FIELDS)
+    result = session.connection().execute(complaints_select(fields, False))
+    return [dict(zip(fields, row)) for row in result]
+
+def best_rate(Session, fn, repeat):
+    best = None
+    for _ in range(repeat):
+        # A fresh session per run, like a request, so the identity map starts empty
+        session = Session()
+        started = time.perf_counter()
+        count = len(fn(session))
+        elapsed = time.perf_counter() - started
+        session.close()
+        rate = count / elapsed
+        best = rate if best is None else max(best, rate)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = build_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    seed(engine, args.rows)
+    Session = sessionmaker(bind=engine)
+
+    cases = [
+        ("/houses", orm_houses, lambda session: core_houses(session, args.rows)),
+        ("/tenants", orm_tenants, core_tenants),
+        ("/complaints", orm_complaints, core_complaints),
+    ]
+    print(f"{'endpoint':<12} {'ORM rows/s':>12} {'Core rows/s':>12} {'speedup':>8}")
+    for name, orm_fn, core_fn in cases:
+        orm = best_rate(Session, orm_fn, args.repeat)
+        core = best_rate(Session, core_fn, args.repeat)
+        print(f"{name:<12} {orm:>12,.0f} {core:>12,.0f} {core / orm:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
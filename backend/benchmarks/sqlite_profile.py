@@ -0,0 +1,113 @@
+"""Mixed read/write throughput on SQLite with and without the performance profile.
+
+Run from the backend directory:
+
+    python -m benchmarks.sqlite_profile --threads 8 --seconds 5 --write-ratio 0.2
+
+Each worker thread loops over the same kind of statements the controllers
+issue: house/tenant listings for reads, and rent payments plus move-in
+vacancy updates for writes. Writes that fail with "database is locked" are
+counted as errors.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Landlord, House, Tenant, Payment
+from app.utils import build_engine
+
+def seed(engine, houses, tenants_per_house):
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    landlord = Landlord(name="Bench", email="bench@example.com", password="x")
+    session.add(landlord)
+    session.flush()
+    for h in range(houses):
+        house = House(
+            address=f"{h} Bench Street",
+            num_apartments=tenants_per_house * 2,
+            rent_price=500 + h,
+            landlord_id=landlord.id,
+            vacant_apartments=tenants_per_house
+        )
+        session.add(house)
+        session.flush()
+        for t in range(tenants_per_house):
+            session.add(Tenant(name=f"T{h}-{t}", email=f"t{h}-{t}@example.com", password="x", house_id=house.id))
+    session.commit()
+    session.close()
+
+def worker(Session, stop, write_ratio, houses, results):
+    rng = random.Random()
+    reads = writes = errors = 0
+    while not stop.is_set():
+        session = Session()
+        house_id = rng.randint(1, houses)
+        try:
+            if rng.random() < write_ratio:
+                tenant = session.query(Tenant).filter(Tenant.house_id == house_id).first()
+                session.add(Payment(amount=100.0, tenant_id=tenant.id))
+                house = session.query(House).get(house_id)
+                house.vacant_apartments += 1
+                session.commit()
+                writes += 1
+            else:
+                session.query(House).filter(House.landlord_id == 1).limit(50).all()
+                session.query(Tenant).filter(Tenant.house_id == house_id).all()
+                reads += 1
+        except OperationalError:
+            session.rollback()
+            errors += 1
+        finally:
+            session.close()
+    results.append((reads, writes, errors))
+
+def run(performance, args):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = build_engine(f"sqlite:///{path}", sqlite_performance=performance)
+    Base.metadata.create_all(bind=engine)
+    seed(engine, args.houses, args.tenants_per_house)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    stop = threading.Event()
+    results = []
+    threads = [
+        threading.Thread(target=worker, args=(Session, stop, args.write_ratio, args.houses, results))
+        for _ in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    reads = sum(r[0] for r in results)
+    writes = sum(r[1] for r in results)
+    errors = sum(r[2] for r in results)
+    label = "performance profile" if performance else "default"
+    print(f"{label:<20} {(reads + writes) / elapsed:>10.0f} ops/s  "
+          f"reads {reads / elapsed:>8.0f}/s  writes {writes / elapsed:>7.0f}/s  locked {errors}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--houses", type=int, default=200)
+    parser.add_argument("--tenants-per-house", type=int, default=10)
+    args = parser.parse_args()
+    run(False, args)
+    run(True, args)
+
+if __name__ == "__main__":
+    main()
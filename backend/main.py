@@ -1,11 +1,24 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request
 from flask_restful import Api
 from flask_cors import CORS  # Import CORS
-from app.utils import engine, Base  # Assuming engine and Base are correctly defined in utils.py
+from app.utils import engine, Base, remove_db_session, mark_read_your_writes  # Assuming engine and Base are correctly defined in utils.py
+from app.metrics import metrics
+from app.responses import message, json_response
+from app.compression import compress_response
+from app.hashing import calibrate_work_factor
+from app.search import ensure_search_index
+from app.versions import ensure_table_versions
+from app.auth import authenticate_request
+from app.config import settings
 from datetime import datetime, timedelta
 
 # Create the tables in the database (use Alembic for production)
 Base.metadata.create_all(bind=engine)
+ensure_search_index(engine)
+ensure_table_versions(engine)
+
+# Pick the bcrypt cost that fits the configured per-hash latency budget
+calibrate_work_factor()
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -14,7 +27,19 @@ api = Api(app)
 # Enable CORS for all routes
 CORS(app, resources={r"/*": {"origins": "*", "methods": ["GET", "POST", "OPTIONS"], "allow_headers": ["Content-Type", "Authorization"]}})
 
-app.config['SECRET_KEY'] = 'your-secret-key-here'
+app.config['SECRET_KEY'] = settings.SECRET_KEY
+
+# Verify bearer tokens and expose landlord_id/tenant_id on flask.g
+app.before_request(authenticate_request)
+
+# Close the request-scoped DB session (if one was opened) after every request
+app.teardown_appcontext(remove_db_session)
+
+# Keep clients that just wrote on the primary so they read their own writes
+app.after_request(mark_read_your_writes)
+
+# gzip/Brotli for JSON bodies above COMPRESS_MIN_SIZE when the client accepts it
+app.after_request(compress_response)
 
 # Define the API routes and resources.
 # Note: Make sure that the resource names (e.g., 'TenantResource' and 'RentStatusResource')
@@ -22,9 +47,12 @@ app.config['SECRET_KEY'] = 'your-secret-key-here'
 api_router = [
     ('/signup/landlord', 'LandlordSignUpResource'),
     ('/login/landlord', 'LandlordLoginResource'),
+    ('/landlords/<int:landlord_id>/dashboard', 'LandlordDashboardResource'),
     ('/houses', 'HouseResource'),
+    ('/houses/suggest', 'HouseSuggestResource'),
     ('/signup/tenant', 'TenantSignUpResource'),
     ('/login/tenant', 'TenantLoginResource'),
+    ('/token/refresh', 'TokenRefreshResource'),
     ('/tenants', 'TenantResource'),            # New resource for fetching tenants
     ('/tenants/move-in', 'TenantMoveInResource'),
     ('/tenants/move-out', 'TenantMoveOutResource'),
@@ -45,9 +73,16 @@ for route, resource_name in api_router:
         print(f"Error importing {resource_name}: {e}")
 
 # Default route
+WELCOME = message("Welcome to the House Management API!")
+
 @app.route('/')
 def home():
-    return jsonify({"message": "Welcome to the House Management API!"})
+    return json_response(WELCOME)
+
+# In-process counters and timings (password pool, caches)
+@app.route('/metrics')
+def get_metrics():
+    return json_response(metrics.snapshot())
 
 # Run the application
 if __name__ == "__main__":
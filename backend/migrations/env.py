@@ -1,5 +1,6 @@
 from logging.config import fileConfig
 from app.models import Base  
+from app.config import settings
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
@@ -14,12 +15,23 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Migrate the same database the app uses (DATABASE_URL), not the ini default.
+# ConfigParser treats % as interpolation, so escape it in URL-encoded passwords.
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# The address search index (FTS5 table, triggers, trigram index) is managed by
+# hand in its own revision, so autogenerate must not try to drop it.
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and compare_to is None and name.startswith(('houses_fts', 'ix_houses_address_trgm')):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -42,6 +54,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -65,7 +78,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
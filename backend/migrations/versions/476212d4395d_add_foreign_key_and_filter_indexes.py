@@ -0,0 +1,48 @@
+"""Add foreign key and filter indexes
+
+Revision ID: 476212d4395d
+Revises: eba345975bc2
+Create Date: 2026-10-18 10:03:17.224905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '476212d4395d'
+down_revision: Union[str, None] = 'eba345975bc2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Primary keys are already indexed; the extra ix_*_id indexes only cost writes
+    op.drop_index(op.f('ix_payments_id'), table_name='payments')
+    op.drop_index(op.f('ix_complaints_id'), table_name='complaints')
+    op.drop_index(op.f('ix_tenants_id'), table_name='tenants')
+    op.drop_index(op.f('ix_houses_id'), table_name='houses')
+    op.drop_index(op.f('ix_landlords_id'), table_name='landlords')
+
+    op.create_index(op.f('ix_houses_landlord_id'), 'houses', ['landlord_id'], unique=False)
+    op.create_index(op.f('ix_houses_rent_price'), 'houses', ['rent_price'], unique=False)
+    op.create_index(op.f('ix_tenants_house_id'), 'tenants', ['house_id'], unique=False)
+    op.create_index(op.f('ix_complaints_tenant_id'), 'complaints', ['tenant_id'], unique=False)
+    # "Last payment" and "paid this month" lookups: tenant_id equality, newest first
+    op.create_index('ix_payments_tenant_id_date', 'payments', ['tenant_id', sa.text('date DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payments_tenant_id_date', table_name='payments')
+    op.drop_index(op.f('ix_complaints_tenant_id'), table_name='complaints')
+    op.drop_index(op.f('ix_tenants_house_id'), table_name='tenants')
+    op.drop_index(op.f('ix_houses_rent_price'), table_name='houses')
+    op.drop_index(op.f('ix_houses_landlord_id'), table_name='houses')
+
+    op.create_index(op.f('ix_landlords_id'), 'landlords', ['id'], unique=False)
+    op.create_index(op.f('ix_houses_id'), 'houses', ['id'], unique=False)
+    op.create_index(op.f('ix_tenants_id'), 'tenants', ['id'], unique=False)
+    op.create_index(op.f('ix_complaints_id'), 'complaints', ['id'], unique=False)
+    op.create_index(op.f('ix_payments_id'), 'payments', ['id'], unique=False)
@@ -0,0 +1,31 @@
+"""Add vacancy search index
+
+Revision ID: 753094c3c280
+Revises: 77db2db43852
+Create Date: 2026-10-18 12:08:33.671290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '753094c3c280'
+down_revision: Union[str, None] = '77db2db43852'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Partial index: only houses with vacancies, ordered cheapest first
+    op.create_index(
+        'ix_houses_vacant_rent_price', 'houses', ['rent_price', 'id'], unique=False,
+        sqlite_where=sa.text('vacant_apartments > 0'),
+        postgresql_where=sa.text('vacant_apartments > 0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_houses_vacant_rent_price', table_name='houses')
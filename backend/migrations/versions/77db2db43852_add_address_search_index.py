@@ -0,0 +1,56 @@
+"""Add address search index
+
+Revision ID: 77db2db43852
+Revises: 476212d4395d
+Create Date: 2026-10-18 11:26:54.093172
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '77db2db43852'
+down_revision: Union[str, None] = '476212d4395d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # External-content FTS5 table over houses.address, kept in sync by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE houses_fts USING fts5("
+            "address, content='houses', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "CREATE TRIGGER houses_fts_ai AFTER INSERT ON houses BEGIN "
+            "INSERT INTO houses_fts(rowid, address) VALUES (new.id, new.address); END"
+        )
+        op.execute(
+            "CREATE TRIGGER houses_fts_ad AFTER DELETE ON houses BEGIN "
+            "INSERT INTO houses_fts(houses_fts, rowid, address) VALUES ('delete', old.id, old.address); END"
+        )
+        op.execute(
+            "CREATE TRIGGER houses_fts_au AFTER UPDATE OF address ON houses BEGIN "
+            "INSERT INTO houses_fts(houses_fts, rowid, address) VALUES ('delete', old.id, old.address); "
+            "INSERT INTO houses_fts(rowid, address) VALUES (new.id, new.address); END"
+        )
+        # Index the houses that already exist
+        op.execute("INSERT INTO houses_fts(houses_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX ix_houses_address_trgm ON houses USING gin (address gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER houses_fts_au")
+        op.execute("DROP TRIGGER houses_fts_ad")
+        op.execute("DROP TRIGGER houses_fts_ai")
+        op.execute("DROP TABLE houses_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX ix_houses_address_trgm")
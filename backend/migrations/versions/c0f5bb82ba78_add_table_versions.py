@@ -0,0 +1,34 @@
+"""Add table versions
+
+Revision ID: c0f5bb82ba78
+Revises: 753094c3c280
+Create Date: 2026-10-18 14:21:07.184532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0f5bb82ba78'
+down_revision: Union[str, None] = '753094c3c280'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every table written through the ORM gets a counter (see app/versions.py)
+VERSIONED_TABLES = ['complaints', 'houses', 'landlords', 'payments', 'refresh_tokens', 'tenants']
+
+
+def upgrade() -> None:
+    table_versions = op.create_table('table_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(table_versions, [{'name': name, 'version': 0} for name in VERSIONED_TABLES])
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
@@ -0,0 +1,73 @@
+"""The hot queries must be answered through an index, not a full table scan.
+
+The schema is built from the models on a throwaway SQLite file and each
+statement is run through EXPLAIN QUERY PLAN.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from app.models import Base, Payment
+from app.queries import HOUSE_FIELDS, complaints_select, houses_select, tenants_select
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+def query_plan(conn, stmt, **params):
+    compiled = stmt.compile(conn)
+    bound = compiled.construct_params(params)
+    positional = tuple(bound[name] for name in compiled.positiontup)
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), positional).all()
+    return [row[-1] for row in rows]
+
+def assert_uses_index(plan, table, index):
+    steps = [step for step in plan if f" {table} " in f" {step} "]
+    assert steps, f"{table} missing from plan {plan}"
+    assert any(f"INDEX {index} " in f"{step} " for step in steps), f"{table} not read through {index}: {plan}"
+
+HOUSE_COLUMNS = tuple(HOUSE_FIELDS)
+
+def test_houses_by_landlord(conn):
+    stmt = houses_select(HOUSE_COLUMNS, 'id', None, True, False, False, False, False)
+    plan = query_plan(conn, stmt, landlord_id=1, limit=50)
+    assert_uses_index(plan, "houses", "ix_houses_landlord_id")
+
+def test_houses_by_rent_price(conn):
+    stmt = houses_select(HOUSE_COLUMNS, 'rent_price', None, False, True, True, False, False)
+    plan = query_plan(conn, stmt, min_price=100.0, max_price=500.0, limit=50)
+    assert_uses_index(plan, "houses", "ix_houses_rent_price")
+
+def test_vacant_houses_by_rent_price(conn):
+    stmt = houses_select(HOUSE_COLUMNS, 'rent_price', None, False, False, False, True, False)
+    plan = query_plan(conn, stmt, limit=50)
+    assert_uses_index(plan, "houses", "ix_houses_vacant_rent_price")
+
+def test_tenants_by_house(conn):
+    stmt = tenants_select(('id', 'name', 'email', 'house_id'), True)
+    plan = query_plan(conn, stmt, house_id=1)
+    assert_uses_index(plan, "tenants", "ix_tenants_house_id")
+
+def test_complaints_by_house(conn):
+    stmt = complaints_select(('id', 'description', 'status', 'tenant_id'), True)
+    plan = query_plan(conn, stmt, house_id=1)
+    assert_uses_index(plan, "tenants", "ix_tenants_house_id")
+    assert_uses_index(plan, "complaints", "ix_complaints_tenant_id")
+
+def test_latest_payment_for_tenant(conn):
+    stmt = select(Payment).where(Payment.tenant_id == 1).order_by(Payment.date.desc()).limit(1)
+    plan = query_plan(conn, stmt)
+    assert_uses_index(plan, "payments", "ix_payments_tenant_id_date")
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+def test_payments_this_month_for_tenant(conn):
+    stmt = select(func.sum(Payment.amount)).where(
+        Payment.tenant_id == 1, Payment.date >= datetime(2026, 1, 1)
+    )
+    plan = query_plan(conn, stmt)
+    assert_uses_index(plan, "payments", "ix_payments_tenant_id_date")